@@ -58,35 +58,69 @@ class EvaluationAnalysisBase(ABC):
         """
         return None
 
-    def save_figure_to_png(self, fig: plt.Figure, suffix: str = "") -> Path:
+    def save_figure_to_png(self, fig: plt.Figure, suffix: str = "", close: bool = True) -> Path:
         """Save matplotlib figure to PNG file."""
         filename = f"{self.name}{suffix}.png" if suffix else f"{self.name}.png"
         output_path = self.plots_dir / filename
         fig.savefig(output_path, dpi=300, bbox_inches="tight")
+        if close:
+            plt.close(fig)
+        return output_path
+
+    def save_figure_to_pdf(self, fig: plt.Figure, suffix: str = "") -> Path:
+        """Save matplotlib figure to PDF file."""
+        filename = f"{self.name}{suffix}.pdf" if suffix else f"{self.name}.pdf"
+        output_path = self.plots_dir / filename
+        fig.savefig(output_path, format="pdf", bbox_inches="tight")
         plt.close(fig)
         return output_path
 
-    def run_figure(self, suffix: str = "") -> Optional[Union[Path, List[Path]]]:
-        """Generate plot(s) and save to PNG."""
+    def _save_figure(self, fig: plt.Figure, suffix: str, pdf: bool) -> Path:
+        """Save figure to PNG, and to PDF from the same figure when requested."""
+        path = self.save_figure_to_png(fig, suffix=suffix, close=not pdf)
+        if pdf:
+            self.save_figure_to_pdf(fig, suffix=suffix)
+        return path
+
+    def run_figure(self, suffix: str = "", pdf: bool = False) -> Optional[Union[Path, List[Path]]]:
+        """
+        Generate plot(s) and save to PNG.
+
+        With pdf=True each figure is also saved to PDF, reusing the figures from a single
+        plot() call rather than rebuilding them via run_figure_pdf(). Returns the PNG paths.
+        """
         result = self.plot()
         if result is None:
             return None
 
         if isinstance(result, plt.Figure):
-            return self.save_figure_to_png(result, suffix=suffix)
+            return self._save_figure(result, suffix, pdf)
 
         if isinstance(result, list):
             paths = []
             for item in result:
                 if isinstance(item, tuple) and len(item) == 2:
                     fig, fig_suffix = item
-                    paths.append(self.save_figure_to_png(fig, suffix=fig_suffix))
+                    paths.append(self._save_figure(fig, fig_suffix, pdf))
                 else:
-                    paths.append(self.save_figure_to_png(item, suffix=suffix))
+                    paths.append(self._save_figure(item, suffix, pdf))
             return paths
 
         return None
 
+    def run_figure_pdf(self) -> list[Path]:
+        """Generate plot(s) and save to PDF."""
+        result = self.plot()
+        if result is None:
+            return []
+
+        paths = []
+        for item in result:
+            if isinstance(item, tuple) and len(item) == 2:
+                fig, fig_suffix = item
+                paths.append(self.save_figure_to_pdf(fig, suffix=fig_suffix))
+        return paths
+
     def run(self) -> tuple[pl.DataFrame, Path]:
         """Execute analysis and save results."""
         df = self.execute()
@@ -773,27 +773,6 @@ class Figure1CompositeAnalysis(EvaluationAnalysisBase):
         plt.tight_layout()
         return fig
 
-    def save_figure_to_pdf(self, fig: plt.Figure, suffix: str = "") -> Path:
-        """Save matplotlib figure to PDF file."""
-        filename = f"{self.name}{suffix}.pdf" if suffix else f"{self.name}.pdf"
-        output_path = self.plots_dir / filename
-        fig.savefig(output_path, format="pdf", bbox_inches="tight")
-        plt.close(fig)
-        return output_path
-
-    def run_figure_pdf(self) -> list[Path]:
-        """Generate plot(s) and save to PDF."""
-        result = self.plot()
-        if result is None:
-            return []
-
-        paths = []
-        for item in result:
-            if isinstance(item, tuple) and len(item) == 2:
-                fig, fig_suffix = item
-                paths.append(self.save_figure_to_pdf(fig, suffix=fig_suffix))
-        return paths
-
 
 if __name__ == "__main__":
     from medguard.evaluation.evaluation import Evaluation, merge_evaluations
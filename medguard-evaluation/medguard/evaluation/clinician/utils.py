@@ -5,6 +5,12 @@ from typing import Any
 
 from .models import AnalysisData, Stage1Data, Stage2Data
 
+# Clinician evaluation folders read by load_stage2_data_from_folder by default
+STAGE2_EVALUATION_FOLDERS = [
+    "outputs/evaluations/evaluations_test_200",
+    "outputs/evaluations/evaluations_test_100",
+]
+
 
 def load_evaluations_from_folder(folder_path) -> list[AnalysisData]:
     files = os.listdir(folder_path)
@@ -44,10 +50,7 @@ def load_evaluations_from_folder(folder_path) -> list[AnalysisData]:
 
 
 def load_stage2_data_from_folder(
-    folder_paths: list[str] = [
-        "outputs/evaluations/evaluations_test_200",
-        "outputs/evaluations/evaluations_test_100",
-    ],
+    folder_paths: list[str] = STAGE2_EVALUATION_FOLDERS,
 ) -> dict[int, Stage2Data]:
     analysis_data = []
     for path in folder_paths:
@@ -1,3 +1,6 @@
+import hashlib
+import pickle
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable
 
@@ -10,7 +13,10 @@ from medguard.evaluation.calibration_metrics import (
     calculate_calibration_metrics,
 )
 from medguard.evaluation.clinician.models import Stage2Data
-from medguard.evaluation.clinician.utils import load_stage2_data_from_folder
+from medguard.evaluation.clinician.utils import (
+    STAGE2_EVALUATION_FOLDERS,
+    load_stage2_data_from_folder,
+)
 from medguard.evaluation.evaluation_metrics import EvaluationMetrics, calculate_evaluation_metrics
 from medguard.evaluation.failure_themes import FailureThemes
 from medguard.evaluation.performance_metrics.filter.performance_metrics import (
@@ -22,8 +28,14 @@ from medguard.evaluation.utils import (
     load_patient_profiles_from_jsonl,
 )
 from medguard.ground_truth.models import GroundTruthAssessmentFull
-from medguard.ground_truth.utils import load_ground_truth_samples
+from medguard.ground_truth.utils import GROUND_TRUTH_SAMPLES_PATH, load_ground_truth_samples
 from medguard.scorer.models import AnalysedPatientRecord
+from medguard.utils.parsing import load_pydantic_from_json, load_trusted_json
+
+# Where load_cleaned_evaluation and load_merged_evaluation_cached keep their pickles
+EVALUATION_CACHE_DIR = Path.home() / ".cache" / "medguard"
+# Bump when the pickled layout changes in a way the code fingerprint would not catch
+EVALUATION_CACHE_FORMAT = 1
 
 
 class Evaluation(BaseModel):
@@ -60,6 +72,9 @@ class Evaluation(BaseModel):
         default=None
     )
     _clinician_evaluations_dict: dict[int, Stage2Data] | None = PrivateAttr(default=None)
+    # Derived lookups, computed once per instance from the cached data above
+    _analysed_records_dict_last: dict[int, AnalysedPatientRecord] | None = PrivateAttr(default=None)
+    _patient_ids: dict[tuple[bool, bool], list[int]] = PrivateAttr(default_factory=dict)
 
     # === Data Access (loads and caches on first access) ===
     @property
@@ -121,7 +136,11 @@ class Evaluation(BaseModel):
     @property
     def analysed_records_dict_last(self) -> dict[int, AnalysedPatientRecord]:
         """Get last record per patient (convenience for non-duplicate cases)."""
-        return {pid: records[-1] for pid, records in self.analysed_records_dict.items() if records}
+        if self._analysed_records_dict_last is None:
+            self._analysed_records_dict_last = {
+                pid: records[-1] for pid, records in self.analysed_records_dict.items() if records
+            }
+        return self._analysed_records_dict_last
 
     @property
     def analysed_records(self) -> list[AnalysedPatientRecord]:
@@ -194,22 +213,26 @@ class Evaluation(BaseModel):
     def patient_ids(
         self, restrict_to_ground_truth: bool = False, restrict_to_clinician_evaluation: bool = False
     ) -> list[int]:
-        """Get all unique patient IDs."""
-        ids = (
-            set(self.analysed_records_dict.keys())
-            & set(self.patient_profiles_dict.keys())
-            & set(self.log_samples_dict.keys())
-        )
-        if restrict_to_ground_truth:
+        """Get all unique patient IDs (computed once per combination of restrictions)."""
+        key = (restrict_to_ground_truth, restrict_to_clinician_evaluation)
+        if key not in self._patient_ids:
             ids = (
-                ids
-                & set(self.ground_truth_samples_dict.keys())
-                & set(self.clinician_evaluations_dict.keys())
+                set(self.analysed_records_dict.keys())
+                & set(self.patient_profiles_dict.keys())
+                & set(self.log_samples_dict.keys())
             )
-
-        if restrict_to_clinician_evaluation:
-            ids = ids & set(self.clinician_evaluations_dict.keys())
-        return list(ids)
+            if restrict_to_ground_truth:
+                ids = (
+                    ids
+                    & set(self.ground_truth_samples_dict.keys())
+                    & set(self.clinician_evaluations_dict.keys())
+                )
+
+            if restrict_to_clinician_evaluation:
+                ids = ids & set(self.clinician_evaluations_dict.keys())
+            self._patient_ids[key] = list(ids)
+        # Copy so callers can't mutate the cached list
+        return list(self._patient_ids[key])
 
     def filter_by_patient_ids(
         self, patient_ids: set[int], description: str | None = None
@@ -483,3 +506,164 @@ def merge_evaluations(evaluations: list[Evaluation]) -> Evaluation:
     evaluation._clinician_evaluations_dict = clinician_evaluations
 
     return evaluation
+
+
+def _mtime_entry(path: str | Path) -> str:
+    """
+    A path with its mtime_ns, for cache keys. Folders list every file in them, so adding,
+    removing or editing a file changes the entry; missing paths are marked as such.
+    """
+    path = Path(path).resolve()
+    if not path.exists():
+        return f"{path}:missing"
+    if path.is_dir():
+        files = sorted(p for p in path.iterdir() if p.is_file())
+        return "\n".join([f"{path}:dir"] + [f"{p}:{p.stat().st_mtime_ns}" for p in files])
+    return f"{path}:{path.stat().st_mtime_ns}"
+
+
+@lru_cache(maxsize=1)
+def evaluation_cache_version() -> str:
+    """
+    Version of the code that builds cached evaluations: the cache format, the Evaluation
+    fields and private attributes, and the medguard package source (path, size and
+    modification time of each module), so pickles are rebuilt after code changes.
+    """
+    digest = hashlib.sha256(f"format:{EVALUATION_CACHE_FORMAT}".encode())
+    for name, field in Evaluation.model_fields.items():
+        digest.update(f"field:{name}:{field.annotation!r}".encode())
+    for name in sorted(Evaluation.__private_attributes__):
+        digest.update(f"private:{name}".encode())
+    package_dir = Path(__file__).resolve().parents[1]
+    for path in sorted(package_dir.rglob("*.py")):
+        stat = path.stat()
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def clean_cache_key(kind: str, sources: list[Path], evaluations: list[Evaluation]) -> str:
+    """
+    Cache key for the clean()ed result of evaluations loaded from the source JSON files.
+
+    A sha256 over the code version (see evaluation_cache_version), the source paths and
+    every input clean() reads (each evaluation's analysed records, raw patient records and
+    logs, plus the clinician evaluations and ground truth), each with its mtime_ns, so a
+    change to any of them invalidates the cache. kind separates caches of different
+    results built from the same inputs.
+    """
+    paths: list[str | Path] = list(sources)
+    for evaluation in evaluations:
+        for field in (
+            evaluation.analysed_patient_records_path,
+            evaluation.raw_patient_records_path,
+            evaluation.logs_path,
+        ):
+            if field is not None:
+                paths.extend(merge_item_or_list([field]))
+    paths.extend(STAGE2_EVALUATION_FOLDERS)
+    paths.append(GROUND_TRUTH_SAMPLES_PATH)
+
+    entries = [kind, evaluation_cache_version()] + [_mtime_entry(p) for p in paths]
+    return hashlib.sha256("\n".join(entries).encode()).hexdigest()
+
+
+def _read_cached_evaluation(cached: Path) -> Evaluation | None:
+    """
+    Unpickle a cached Evaluation, or None if it is missing or unusable.
+
+    Pickles from older code (unreadable, of another type, or missing fields or private
+    attributes the current Evaluation has) are deleted and treated as a cache miss, so
+    they are rebuilt rather than failing later on attribute access.
+    """
+    if not cached.exists():
+        return None
+    try:
+        with open(cached, "rb") as f:
+            evaluation = pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+        evaluation = None
+
+    if (
+        isinstance(evaluation, Evaluation)
+        and Evaluation.model_fields.keys() <= evaluation.__dict__.keys()
+        and Evaluation.__private_attributes__.keys()
+        <= (evaluation.__pydantic_private__ or {}).keys()
+    ):
+        return evaluation
+
+    cached.unlink(missing_ok=True)
+    return None
+
+
+def _write_cached_evaluation(cached: Path, evaluation: Evaluation) -> None:
+    """Pickle an Evaluation to the cache, via a temporary file so readers never see a
+    partial write."""
+    EVALUATION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(evaluation, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(cached)
+
+
+def load_cleaned_evaluation(path: str | Path) -> Evaluation:
+    """
+    Load an Evaluation from JSON and clean() it, caching the cleaned result on disk.
+
+    The cache is a pickle under EVALUATION_CACHE_DIR, so the lazily loaded records survive
+    (model_dump_json would drop the private caches). It is keyed on every input clean()
+    reads and on the code version (see clean_cache_key), so it is rebuilt when any of them
+    changes; an unreadable or outdated pickle is rebuilt too.
+    """
+    path = Path(path).resolve()
+    evaluation = load_pydantic_from_json(Evaluation, path)
+    cached = EVALUATION_CACHE_DIR / f"{clean_cache_key('cleaned', [path], [evaluation])}.pkl"
+    cached_evaluation = _read_cached_evaluation(cached)
+    if cached_evaluation is not None:
+        return cached_evaluation
+
+    evaluation = evaluation.clean()
+    _write_cached_evaluation(cached, evaluation)
+    return evaluation
+
+
+def load_merged_evaluation_cached(paths: list[str | Path]) -> Evaluation:
+    """
+    Load evaluations from JSON, merge them in the given order and clean() the result,
+    caching the cleaned merge as a pickle under EVALUATION_CACHE_DIR.
+
+    The cache is keyed on every input clean() reads and on the code version (see
+    clean_cache_key), so editing or replacing any source JSON, record file, log, clinician
+    evaluation or the ground truth, or changing the code, invalidates it; an unreadable or
+    outdated pickle is rebuilt too. Sources are read with load_trusted_json, as they are
+    our own evaluation outputs.
+    """
+    paths = [Path(p).resolve() for p in paths]
+    evaluations = [load_trusted_json(Evaluation, p) for p in paths]
+    cached = EVALUATION_CACHE_DIR / f"{clean_cache_key('merged', paths, evaluations)}.pkl"
+    cached_evaluation = _read_cached_evaluation(cached)
+    if cached_evaluation is not None:
+        return cached_evaluation
+
+    evaluation = merge_evaluations(evaluations).clean()
+    _write_cached_evaluation(cached, evaluation)
+    return evaluation
+
+
+def clear_evaluation_cache() -> int:
+    """
+    Delete the cleaned-evaluation pickles in EVALUATION_CACHE_DIR.
+
+    Code and input changes are picked up without it (see clean_cache_key), but superseded
+    entries are never removed automatically (their keys simply stop matching), so call
+    this (or run scripts/generate_vignettes.py --clear-cache, or delete the folder) to
+    reclaim the space.
+
+    Returns:
+        Number of cache files deleted
+    """
+    if not EVALUATION_CACHE_DIR.exists():
+        return 0
+    cached = list(EVALUATION_CACHE_DIR.glob("*.pkl")) + list(EVALUATION_CACHE_DIR.glob("*.tmp"))
+    for path in cached:
+        path.unlink(missing_ok=True)
+    return len(cached)
@@ -1,3 +1,4 @@
+import polars as pl
 from medguard.evaluation.clinician.models import Stage2Data
 from pydantic import BaseModel
 
@@ -113,5 +114,54 @@ def get_full_performance_metrics(
 def clinician_evaluations_to_performance_metrics(
     data: list[Stage2Data],
 ) -> GroundTruthPerformanceMetrics:
-    data = get_full_performance_metrics([analysis_data_to_performance_metrics(x) for x in data])
-    return data
+    """
+    Sum analysis_data_to_performance_metrics over all evaluations in one polars pass.
+
+    Equivalent to get_full_performance_metrics over the per-evaluation metrics, without
+    building a GroundTruthPerformanceMetrics per evaluation.
+    """
+    df = pl.DataFrame(
+        {
+            "issue_assessments": [x.issue_assessments for x in data],
+            "missed_issues": [x.missed_issues for x in data],
+            "intervention": [x.medguard_specific_intervention for x in data],
+        },
+        schema={
+            "issue_assessments": pl.List(pl.Boolean),
+            "missed_issues": pl.String,
+            "intervention": pl.String,
+        },
+    )
+
+    assessments = pl.col("issue_assessments")
+    positive = assessments.list.any() | (pl.col("missed_issues") == "yes")
+    any_issue = assessments.list.len() > 0
+
+    positive_any_issue = positive & any_issue
+    positive_all_correct = (
+        positive_any_issue & assessments.list.all() & (pl.col("missed_issues") == "no")
+    )
+    positive_some_correct = positive_any_issue & assessments.list.any() & ~positive_all_correct
+
+    intervention = pl.col("intervention")
+    flags = {
+        "positive": positive,
+        "negative": ~positive,
+        "positive_any_issue": positive_any_issue,
+        "positive_no_issue": positive & ~any_issue,
+        "negative_any_issue": ~positive & any_issue,
+        "negative_no_issue": ~positive & ~any_issue,
+        "positive_all_correct": positive_all_correct,
+        "positive_some_correct": positive_some_correct,
+        "positive_no_correct": positive_any_issue & ~assessments.list.any(),
+        "all_correct_correct_intervention": positive_all_correct & (intervention == "yes"),
+        "all_correct_partial_intervention": positive_all_correct & (intervention == "partial"),
+        "all_correct_incorrect_intervention": positive_all_correct & (intervention == "no"),
+        "some_correct_correct_intervention": positive_some_correct & (intervention == "yes"),
+        "some_correct_partial_intervention": positive_some_correct & (intervention == "partial"),
+        "some_correct_incorrect_intervention": positive_some_correct & (intervention == "no"),
+    }
+    counts = df.select([flag.cast(pl.Int64).sum().alias(name) for name, flag in flags.items()]).row(
+        0, named=True
+    )
+    return GroundTruthPerformanceMetrics(**counts)
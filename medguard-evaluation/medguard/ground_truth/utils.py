@@ -7,9 +7,12 @@ from medguard.utils.parsing import read_jsonl
 
 from .models import GroundTruthAssessment, GroundTruthAssessmentFull
 
+# Ground truth read by load_ground_truth_samples by default
+GROUND_TRUTH_SAMPLES_PATH = "outputs/ground_truth/2025-10-28-test-set.jsonl"
+
 
 def load_ground_truth_samples(
-    path: str = "outputs/ground_truth/2025-10-28-test-set.jsonl",
+    path: str = GROUND_TRUTH_SAMPLES_PATH,
 ) -> dict[str, GroundTruthAssessmentFull]:
     # Load the ground truth samples
     ground_truth_samples = [
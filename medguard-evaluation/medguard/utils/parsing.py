@@ -1,11 +1,19 @@
+import io
 import json
+import types
+from enum import Enum
 from pathlib import Path
-from typing import Any, Generator, Type, TypeVar
+from typing import Any, Generator, Iterator, Type, TypeVar, Union, get_args, get_origin
 
+import orjson
 from pydantic import BaseModel
 
 T = TypeVar("T", bound=BaseModel)
 
+# Files at least this large are parsed with orjson before validation; smaller files are
+# validated straight from bytes by pydantic-core, which is faster when parsing is cheap
+ORJSON_MIN_BYTES = 64 * 1024
+
 
 def read_jsonl(file_path: str) -> Generator[Any, None, None]:
     with open(file_path, "r", encoding="utf-8") as file:
@@ -16,9 +24,13 @@ def read_jsonl(file_path: str) -> Generator[Any, None, None]:
 
 
 def save_pydantic_list_to_jsonl(pydantic_list: list[BaseModel], path: str):
-    with open(path, "w") as f:
-        for item in pydantic_list:
-            f.write(item.model_dump_json() + "\n")
+    # pydantic-core serialises each model straight to UTF-8 bytes; lines are appended to one
+    # buffer (no per-line concatenation copies) and the file is written in one call
+    buffer = io.BytesIO()
+    for item in pydantic_list:
+        buffer.write(item.__pydantic_serializer__.to_json(item))
+        buffer.write(b"\n")
+    Path(path).write_bytes(buffer.getbuffer())
 
 
 def load_pydantic_from_json(model_class: Type[T], path: str | Path) -> T:
@@ -35,9 +47,77 @@ def load_pydantic_from_json(model_class: Type[T], path: str | Path) -> T:
     Example:
         eval = load_pydantic_from_json(Evaluation, "outputs/evaluation.json")
     """
-    with open(path, "r") as f:
-        data = json.load(f)
-    return model_class.model_validate(data)
+    raw = Path(path).read_bytes()
+    if len(raw) < ORJSON_MIN_BYTES:
+        return model_class.model_validate_json(raw)
+    return model_class.model_validate(orjson.loads(raw))
+
+
+def _construct_value(annotation: Any, value: Any) -> Any:
+    """Hydrate a decoded JSON value into the type described by annotation, without validation."""
+    if value is None:
+        return None
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _construct_model(annotation, value) if isinstance(value, dict) else value
+        if issubclass(annotation, (Path, Enum)):
+            return annotation(value)
+        return value
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in (list, set, frozenset, tuple) and isinstance(value, list):
+        item_type = args[0] if args else Any
+        return origin(_construct_value(item_type, item) for item in value)
+    if origin is dict and isinstance(value, dict):
+        key_type, value_type = args if args else (Any, Any)
+        return {
+            _construct_value(key_type, k): _construct_value(value_type, v) for k, v in value.items()
+        }
+    if origin in (Union, types.UnionType):
+        # Pick the member matching the JSON container kind (e.g. Path | list[Path])
+        for arg in args:
+            arg_origin = get_origin(arg) or arg
+            if isinstance(value, list) and arg_origin in (list, set, frozenset, tuple):
+                return _construct_value(arg, value)
+            if isinstance(value, dict) and (
+                arg_origin is dict or (isinstance(arg, type) and issubclass(arg, BaseModel))
+            ):
+                return _construct_value(arg, value)
+            if not isinstance(value, (list, dict)) and arg is not type(None):
+                return _construct_value(arg, value)
+    return value
+
+
+def _construct_model(model_class: Type[T], data: dict[str, Any]) -> T:
+    fields = {
+        name: _construct_value(field.annotation, data[name])
+        for name, field in model_class.model_fields.items()
+        if name in data
+    }
+    return model_class.model_construct(**fields)
+
+
+def load_trusted_json(model_class: Type[T], path: str | Path) -> T:
+    """
+    Load a Pydantic model from a JSON file written by our own pipeline, skipping validation.
+
+    Nested models are built recursively with model_construct, and Path, set and Enum
+    fields are converted from their JSON form, but field types and validators are not
+    checked. Only use this for trusted, read-only inputs; use load_pydantic_from_json
+    for anything else.
+
+    Args:
+        model_class: The Pydantic model class to load into
+        path: Path to the JSON file
+
+    Returns:
+        Instance of model_class
+
+    Example:
+        eval = load_trusted_json(Evaluation, "outputs/evaluation.json")
+    """
+    return _construct_model(model_class, orjson.loads(Path(path).read_bytes()))
 
 
 def load_pydantic_list_from_jsonl(model_class: Type[T], path: str | Path) -> list[T]:
@@ -58,3 +138,26 @@ def load_pydantic_list_from_jsonl(model_class: Type[T], path: str | Path) -> lis
     for data in read_jsonl(str(path)):
         models.append(model_class.model_validate(data))
     return models
+
+
+def iter_pydantic_from_jsonl(model_class: Type[T], path: str | Path) -> Iterator[T]:
+    """
+    Lazily load Pydantic models from a JSONL file, one line at a time.
+
+    Unlike load_pydantic_list_from_jsonl, only the current record is held in memory.
+
+    Args:
+        model_class: The Pydantic model class to load into
+        path: Path to the JSONL file
+
+    Yields:
+        model_class instances in file order
+
+    Example:
+        for vignette in iter_pydantic_from_jsonl(PatientVignette, "vignettes.jsonl"):
+            ...
+    """
+    with open(path, "rb", buffering=1 << 20) as f:
+        for line in f:
+            if line.strip():
+                yield model_class.model_validate_json(line)
@@ -437,7 +437,7 @@ def save_vignette_html(vignette: PatientVignette, output_path: Path) -> None:
         output_path: Path where to save the HTML file
     """
     html = generate_html_from_vignette(vignette)
-    output_path.write_text(html, encoding="utf-8")
+    output_path.write_bytes(html.encode("utf-8"))
 
 
 def generate_html_from_vignette_with_feedback(vignette: PatientVignetteWithFeedback) -> str:
@@ -765,4 +765,4 @@ def save_vignette_with_feedback_html(
         output_path: Path where to save the HTML file
     """
     html = generate_html_from_vignette_with_feedback(vignette)
-    output_path.write_text(html, encoding="utf-8")
+    output_path.write_bytes(html.encode("utf-8"))
@@ -2,43 +2,60 @@
 Generate HTML files for all patient vignettes.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from medguard.utils.parsing import load_pydantic_list_from_jsonl
+
+from medguard.utils.parsing import iter_pydantic_from_jsonl
 from medguard.vignette.models import PatientVignette
 from medguard.vignette.html_generator import save_vignette_html
 
+OUTPUT_DIR = Path("outputs/vignettes/html")
+
+# Number of vignettes read from the stream and handed to the pool at a time
+BATCH_SIZE = 256
+
+
+def _render(vignette: PatientVignette) -> None:
+    """Render a single vignette to HTML (runs in a worker process)."""
+    output_path = OUTPUT_DIR / f"vignette_{vignette.patient_id_hash[:8]}.html"
+    save_vignette_html(vignette, output_path)
+
 
 def main():
-    # Load vignettes
+    # Stream vignettes rather than materialising the full list
     vignettes_path = "outputs/vignettes/2025-10-29-vignettes.jsonl"
-    print(f"Loading vignettes from {vignettes_path}...")
-    vignettes = load_pydantic_list_from_jsonl(PatientVignette, vignettes_path)
-    print(f"Loaded {len(vignettes)} vignettes")
+    print(f"Streaming vignettes from {vignettes_path}...")
+    vignettes = iter_pydantic_from_jsonl(PatientVignette, vignettes_path)
 
     # Create output directory
-    output_dir = Path("outputs/vignettes/html")
+    output_dir = OUTPUT_DIR
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate HTML for all vignettes
+    # Generate HTML for all vignettes, one task per vignette across worker processes.
+    # Only running counters (kept in the parent) survive past each batch.
     print(f"\nGenerating HTML files...")
-    for i, vignette in enumerate(vignettes, 1):
-        output_path = output_dir / f"vignette_{vignette.patient_id_hash[:8]}.html"
-        save_vignette_html(vignette, output_path)
-
-        if i % 10 == 0:
-            print(f"  Generated {i}/{len(vignettes)} files...")
-
-    print(f"\n✓ Successfully generated {len(vignettes)} HTML files")
+    total = 0
+    intervention_required = 0
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        while batch := list(islice(vignettes, BATCH_SIZE)):
+            for vignette, _ in zip(batch, executor.map(_render, batch, chunksize=16)):
+                total += 1
+                intervention_required += vignette.medguard_intervention_required
+                if total % 10 == 0:
+                    print(f"  Generated {total} files...")
+
+    print(f"\n✓ Successfully generated {total} HTML files")
     print(f"  Output directory: {output_dir.absolute()}")
 
     # Print some statistics
     print(f"\nStatistics:")
-    intervention_required = sum(1 for v in vignettes if v.medguard_intervention_required)
     print(
-        f"  Vignettes with intervention required: {intervention_required} ({intervention_required / len(vignettes) * 100:.1f}%)"
+        f"  Vignettes with intervention required: {intervention_required} ({intervention_required / total * 100:.1f}%)"
     )
     print(
-        f"  Vignettes without intervention: {len(vignettes) - intervention_required} ({(len(vignettes) - intervention_required) / len(vignettes) * 100:.1f}%)"
+        f"  Vignettes without intervention: {total - intervention_required} ({(total - intervention_required) / total * 100:.1f}%)"
     )
 
 
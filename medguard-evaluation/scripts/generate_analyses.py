@@ -20,27 +20,39 @@ outputs. External users can view the pre-computed results in outputs/eval_analys
 but cannot regenerate them.
 """
 
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
 
-from medguard.analysis import (
-    ComplexityCorrelationAnalysis,
-    Figure1CompositeAnalysis,
-    ModelComparisonAnalysis,
-)
-from medguard.evaluation.evaluation import Evaluation, merge_evaluations
-from medguard.utils.parsing import load_pydantic_from_json
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser
+
+# Heavy modules (analysis, evaluation, playwright) are imported where first used
 
 # Paths
 ANALYSIS_DIR = Path(__file__).parent.parent / "medguard" / "analysis"
 PLOTS_DIR = Path(__file__).parent.parent / "outputs" / "eval_analyses" / "plots"
 
+# (model name, evaluation path) pairs for the Figure 1e model comparison
+MODEL_EVALUATION_PATHS: list[tuple[str, str]] = [
+    ("gpt-oss-120b-low", "outputs/20251104/gpt-oss-120b-low/evaluation.json"),
+    ("gpt-oss-120b-medium", "outputs/20251104/gpt-oss-120b-medium/evaluation.json"),
+    ("gpt-oss-120b-high", "outputs/20251104/gpt-oss-120b-high/evaluation.json"),
+    ("gpt-oss-20b-medium", "outputs/20251104/gpt-oss-20b-medium/evaluation.json"),
+    ("gemma", "outputs/20251104/gemma/evaluation.json"),
+    ("medgemma", "outputs/20251104/medgemma/evaluation.json"),
+]
+
 
-def html_to_pdf(html_path: Path, pdf_path: Path) -> bool:
+@contextmanager
+def chromium_browser() -> Iterator[Optional["Browser"]]:
     """
-    Convert HTML file to PDF using playwright.
+    Launch one headless Chromium browser to share across all HTML to PDF conversions.
 
-    Returns True if successful, False otherwise.
+    Yields None if playwright is not installed or the browser fails to launch.
     """
     try:
         from playwright.sync_api import sync_playwright
@@ -48,21 +60,57 @@ def html_to_pdf(html_path: Path, pdf_path: Path) -> bool:
         print(
             "  ⚠ playwright not installed. Install with: uv add playwright && playwright install chromium"
         )
+        yield None
+        return
+
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch()
+        except Exception as e:
+            print(f"  ⚠ Failed to launch chromium: {e}")
+            browser = None
+        try:
+            yield browser
+        finally:
+            if browser is not None:
+                browser.close()
+
+
+def html_to_pdf(browser: Optional["Browser"], html_path: Path, pdf_path: Path) -> bool:
+    """
+    Convert HTML file to PDF using an already-launched playwright browser.
+
+    Returns True if successful, False otherwise.
+    """
+    if browser is None:
         return False
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
+        page = browser.new_page()
+        try:
             page.goto(f"file://{html_path.absolute()}")
             page.pdf(path=str(pdf_path), format="A4", print_background=True)
-            browser.close()
+        finally:
+            page.close()
         return True
     except Exception as e:
         print(f"  ⚠ Failed to convert {html_path.name}: {e}")
         return False
 
 
+def _alias(src: Path, dst: Path) -> None:
+    """
+    Expose src under the figure name dst as a hard link (no bytes copied).
+
+    Falls back to a copy where hard links are unsupported (e.g. across devices).
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
 def main():
     print("=" * 70)
     print("MEDGUARD PAPER FIGURE GENERATION")
@@ -75,14 +123,22 @@ def main():
     # LOAD EVALUATIONS
     # ========================================================================
     print("\n1. Loading evaluations...")
-
-    # Primary evaluation: 300-patient cohort (200 + 100 merged)
-    evaluation_200 = load_pydantic_from_json(
-        Evaluation, "outputs/20251018/test-set/evaluation.json"
-    )
-    evaluation_100 = load_pydantic_from_json(
-        Evaluation, "outputs/20251027/no-filters/evaluation.json"
+    from medguard.evaluation.evaluation import (
+        Evaluation,
+        load_cleaned_evaluation,
+        merge_evaluations,
     )
+    from medguard.utils.parsing import load_pydantic_from_json
+
+    # Primary evaluation: 300-patient cohort (200 + 100 merged), read concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        evaluation_200, evaluation_100 = executor.map(
+            lambda path: load_pydantic_from_json(Evaluation, path),
+            [
+                "outputs/20251018/test-set/evaluation.json",
+                "outputs/20251027/no-filters/evaluation.json",
+            ],
+        )
     print(f"   - Loaded {len(evaluation_200.patient_ids())} from test-set")
     print(f"   - Loaded {len(evaluation_100.patient_ids())} from no-filters")
 
@@ -92,158 +148,132 @@ def main():
 
     # Model comparison evaluations
     print("\n2. Loading model comparison evaluations...")
-    model_evaluations: list[tuple[str, Evaluation]] = [
-        (
-            "gpt-oss-120b-low",
-            load_pydantic_from_json(
-                Evaluation, "outputs/20251104/gpt-oss-120b-low/evaluation.json"
-            ).clean(),
-        ),
-        (
-            "gpt-oss-120b-medium",
-            load_pydantic_from_json(
-                Evaluation, "outputs/20251104/gpt-oss-120b-medium/evaluation.json"
-            ).clean(),
-        ),
-        (
-            "gpt-oss-120b-high",
-            load_pydantic_from_json(
-                Evaluation, "outputs/20251104/gpt-oss-120b-high/evaluation.json"
-            ).clean(),
-        ),
-        (
-            "gpt-oss-20b-medium",
-            load_pydantic_from_json(
-                Evaluation, "outputs/20251104/gpt-oss-20b-medium/evaluation.json"
-            ).clean(),
-        ),
-        (
-            "gemma",
-            load_pydantic_from_json(Evaluation, "outputs/20251104/gemma/evaluation.json").clean(),
-        ),
-        (
-            "medgemma",
-            load_pydantic_from_json(
-                Evaluation, "outputs/20251104/medgemma/evaluation.json"
-            ).clean(),
-        ),
-    ]
+    with ThreadPoolExecutor(max_workers=len(MODEL_EVALUATION_PATHS)) as executor:
+        model_evaluations: list[tuple[str, Evaluation]] = list(
+            executor.map(
+                lambda spec: (spec[0], load_cleaned_evaluation(spec[1])),
+                MODEL_EVALUATION_PATHS,
+            )
+        )
     print(f"   - Loaded {len(model_evaluations)} models")
 
-    # ========================================================================
-    # FIGURE 1a: Primary Workflow (HTML to PDF)
-    # ========================================================================
-    print("\n" + "-" * 70)
-    print("Figure 1a: Primary Workflow")
-    print("-" * 70)
-
-    workflow_html = ANALYSIS_DIR / "workflow_flowchart_primary.html"
-    figure_1a_pdf = PLOTS_DIR / "figure_1a.pdf"
-
-    if workflow_html.exists():
-        print(f"  Source: {workflow_html.name}")
-        if html_to_pdf(workflow_html, figure_1a_pdf):
-            print(f"  ✓ Saved: {figure_1a_pdf}")
+    # Single browser shared by every HTML to PDF conversion below
+    with chromium_browser() as browser:
+        # ========================================================================
+        # FIGURE 1a: Primary Workflow (HTML to PDF)
+        # ========================================================================
+        print("\n" + "-" * 70)
+        print("Figure 1a: Primary Workflow")
+        print("-" * 70)
+
+        workflow_html = ANALYSIS_DIR / "workflow_flowchart_primary.html"
+        figure_1a_pdf = PLOTS_DIR / "figure_1a.pdf"
+
+        if workflow_html.exists():
+            print(f"  Source: {workflow_html.name}")
+            if html_to_pdf(browser, workflow_html, figure_1a_pdf):
+                print(f"  ✓ Saved: {figure_1a_pdf}")
+            else:
+                print(f"  ✗ Failed to generate figure_1a.pdf")
         else:
-            print(f"  ✗ Failed to generate figure_1a.pdf")
-    else:
-        print(f"  ✗ Source not found: {workflow_html}")
-
-    # ========================================================================
-    # FIGURE 1b & 1c: Hierarchical Evaluation and Failure Modes
-    # ========================================================================
-    print("\n" + "-" * 70)
-    print("Figure 1b & 1c: Hierarchical Evaluation and Failure Modes")
-    print("-" * 70)
-
-    figure1_analysis = Figure1CompositeAnalysis(primary_evaluation)
-    print("  Running Figure1CompositeAnalysis...")
-    figure1_analysis.run()
-    figure1_analysis.run_figure()
-
-    # Copy panel outputs to figure_1b and figure_1c
-    panel_a = PLOTS_DIR / "figure_1_composite_panel_a.pdf"
-    panel_c = PLOTS_DIR / "figure_1_composite_panel_c.pdf"
-    figure_1b_pdf = PLOTS_DIR / "figure_1b.pdf"
-    figure_1c_pdf = PLOTS_DIR / "figure_1c.pdf"
-
-    # Generate PDFs
-    figure1_analysis.run_figure_pdf()
-
-    if panel_a.exists():
-        shutil.copy(panel_a, figure_1b_pdf)
-        print(f"  ✓ Saved: {figure_1b_pdf}")
-    else:
-        print(f"  ✗ Panel A not found: {panel_a}")
-
-    if panel_c.exists():
-        shutil.copy(panel_c, figure_1c_pdf)
-        print(f"  ✓ Saved: {figure_1c_pdf}")
-    else:
-        print(f"  ✗ Panel C not found: {panel_c}")
+            print(f"  ✗ Source not found: {workflow_html}")
+
+        # ========================================================================
+        # FIGURE 1b & 1c: Hierarchical Evaluation and Failure Modes
+        # ========================================================================
+        print("\n" + "-" * 70)
+        print("Figure 1b & 1c: Hierarchical Evaluation and Failure Modes")
+        print("-" * 70)
+
+        from medguard.analysis import Figure1CompositeAnalysis
+
+        figure1_analysis = Figure1CompositeAnalysis(primary_evaluation)
+        print("  Running Figure1CompositeAnalysis...")
+        figure1_analysis.run()
+        figure1_analysis.run_figure(pdf=True)
+
+        # Copy panel outputs to figure_1b and figure_1c
+        panel_a = PLOTS_DIR / "figure_1_composite_panel_a.pdf"
+        panel_c = PLOTS_DIR / "figure_1_composite_panel_c.pdf"
+        figure_1b_pdf = PLOTS_DIR / "figure_1b.pdf"
+        figure_1c_pdf = PLOTS_DIR / "figure_1c.pdf"
+
+        if panel_a.exists():
+            _alias(panel_a, figure_1b_pdf)
+            print(f"  ✓ Saved: {figure_1b_pdf}")
+        else:
+            print(f"  ✗ Panel A not found: {panel_a}")
 
-    # ========================================================================
-    # FIGURE 1d: Complexity Correlation Matrix
-    # ========================================================================
-    print("\n" + "-" * 70)
-    print("Figure 1d: Complexity Correlation Matrix")
-    print("-" * 70)
+        if panel_c.exists():
+            _alias(panel_c, figure_1c_pdf)
+            print(f"  ✓ Saved: {figure_1c_pdf}")
+        else:
+            print(f"  ✗ Panel C not found: {panel_c}")
 
-    complexity_analysis = ComplexityCorrelationAnalysis(primary_evaluation)
-    print("  Running ComplexityCorrelationAnalysis...")
-    complexity_analysis.run()
-    complexity_analysis.run_figure()
-    complexity_analysis.run_figure_pdf()
+        # ========================================================================
+        # FIGURE 1d: Complexity Correlation Matrix
+        # ========================================================================
+        print("\n" + "-" * 70)
+        print("Figure 1d: Complexity Correlation Matrix")
+        print("-" * 70)
 
-    corr_matrix = PLOTS_DIR / "complexity_correlation_correlation_matrix.pdf"
-    figure_1d_pdf = PLOTS_DIR / "figure_1d.pdf"
+        from medguard.analysis import ComplexityCorrelationAnalysis
 
-    if corr_matrix.exists():
-        shutil.copy(corr_matrix, figure_1d_pdf)
-        print(f"  ✓ Saved: {figure_1d_pdf}")
-    else:
-        print(f"  ✗ Correlation matrix not found: {corr_matrix}")
+        complexity_analysis = ComplexityCorrelationAnalysis(primary_evaluation)
+        print("  Running ComplexityCorrelationAnalysis...")
+        complexity_analysis.run()
+        complexity_analysis.run_figure(pdf=True)
 
-    # ========================================================================
-    # FIGURE 1e: Model Comparison
-    # ========================================================================
-    print("\n" + "-" * 70)
-    print("Figure 1e: Model Comparison")
-    print("-" * 70)
+        corr_matrix = PLOTS_DIR / "complexity_correlation_correlation_matrix.pdf"
+        figure_1d_pdf = PLOTS_DIR / "figure_1d.pdf"
 
-    model_comparison = ModelComparisonAnalysis(model_evaluations)
-    print("  Running ModelComparisonAnalysis...")
-    model_comparison.run()
-    model_comparison.run_figure()
-    model_comparison.run_figure_pdf()
+        if corr_matrix.exists():
+            _alias(corr_matrix, figure_1d_pdf)
+            print(f"  ✓ Saved: {figure_1d_pdf}")
+        else:
+            print(f"  ✗ Correlation matrix not found: {corr_matrix}")
 
-    model_comp = PLOTS_DIR / "model_comparison_comparison.pdf"
-    figure_1e_pdf = PLOTS_DIR / "figure_1e.pdf"
+        # ========================================================================
+        # FIGURE 1e: Model Comparison
+        # ========================================================================
+        print("\n" + "-" * 70)
+        print("Figure 1e: Model Comparison")
+        print("-" * 70)
 
-    if model_comp.exists():
-        shutil.copy(model_comp, figure_1e_pdf)
-        print(f"  ✓ Saved: {figure_1e_pdf}")
-    else:
-        print(f"  ✗ Model comparison not found: {model_comp}")
+        from medguard.analysis import ModelComparisonAnalysis
 
-    # ========================================================================
-    # FIGURE 2: Failure Analysis Vignettes (HTML to PDF)
-    # ========================================================================
-    print("\n" + "-" * 70)
-    print("Figure 2: Failure Analysis Vignettes")
-    print("-" * 70)
+        model_comparison = ModelComparisonAnalysis(model_evaluations)
+        print("  Running ModelComparisonAnalysis...")
+        model_comparison.run()
+        model_comparison.run_figure(pdf=True)
 
-    figure2_html = ANALYSIS_DIR / "figure_2.html"
-    figure_2_pdf = PLOTS_DIR / "figure_2.pdf"
+        model_comp = PLOTS_DIR / "model_comparison_comparison.pdf"
+        figure_1e_pdf = PLOTS_DIR / "figure_1e.pdf"
 
-    if figure2_html.exists():
-        print(f"  Source: {figure2_html.name}")
-        if html_to_pdf(figure2_html, figure_2_pdf):
-            print(f"  ✓ Saved: {figure_2_pdf}")
+        if model_comp.exists():
+            _alias(model_comp, figure_1e_pdf)
+            print(f"  ✓ Saved: {figure_1e_pdf}")
+        else:
+            print(f"  ✗ Model comparison not found: {model_comp}")
+
+        # ========================================================================
+        # FIGURE 2: Failure Analysis Vignettes (HTML to PDF)
+        # ========================================================================
+        print("\n" + "-" * 70)
+        print("Figure 2: Failure Analysis Vignettes")
+        print("-" * 70)
+
+        figure2_html = ANALYSIS_DIR / "figure_2.html"
+        figure_2_pdf = PLOTS_DIR / "figure_2.pdf"
+
+        if figure2_html.exists():
+            print(f"  Source: {figure2_html.name}")
+            if html_to_pdf(browser, figure2_html, figure_2_pdf):
+                print(f"  ✓ Saved: {figure_2_pdf}")
+            else:
+                print(f"  ✗ Failed to generate figure_2.pdf")
         else:
-            print(f"  ✗ Failed to generate figure_2.pdf")
-    else:
-        print(f"  ✗ Source not found: {figure2_html}")
+            print(f"  ✗ Source not found: {figure2_html}")
 
     # ========================================================================
     # SUMMARY
@@ -17,14 +17,20 @@ Usage:
 
 import argparse
 import csv
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Literal
 
+from medguard.evaluation.clinician.models import Stage2Data
 from medguard.evaluation.evaluation import Evaluation, merge_evaluations
 from medguard.evaluation.performance_metrics.ground_truth.performance_metrics import (
     GroundTruthPerformanceMetrics,
     analysis_data_to_performance_metrics,
 )
+from medguard.scorer.models import AnalysedPatientRecord
 from medguard.utils.parsing import load_pydantic_from_json
 from medguard.vignette.html_generator import save_vignette_with_feedback_html
 from medguard.vignette.markdown_generator import generate_markdown_from_vignette_with_feedback
@@ -39,58 +45,168 @@ FailureCategory = Literal[
     "06_l3_intervention_incorrect",
 ]
 
+# Failure categories in index order, as returned by categorize_patient
+CATEGORIES: tuple[FailureCategory, ...] = (
+    "01_l1_false_negative",
+    "02_l1_false_positive",
+    "03_l2_issues_incorrect",
+    "04_l2_issues_partially_correct",
+    "05_l3_intervention_partially_correct",
+    "06_l3_intervention_incorrect",
+)
 
-def categorize_patient(metrics: GroundTruthPerformanceMetrics) -> FailureCategory | None:
+# Columns of the vignettes_index.csv file
+INDEX_FIELDNAMES = (
+    "patient_id",
+    "patient_id_hash",
+    "category",
+    "description",
+    "html_file",
+    "markdown_file",
+)
+
+_CATEGORY_DESCRIPTIONS: dict[FailureCategory, str] = {
+    "01_l1_false_negative": "Level 1 False Negative",
+    "02_l1_false_positive": "Level 1 False Positive",
+    "03_l2_issues_incorrect": "Level 2 Issues Incorrect",
+    "04_l2_issues_partially_correct": "Level 2 Issues Partially Correct",
+    "05_l3_intervention_partially_correct": "Level 3 Intervention Partially Correct",
+    "06_l3_intervention_incorrect": "Level 3 Intervention Incorrect",
+}
+
+
+def categorize_patient(metrics: GroundTruthPerformanceMetrics) -> int | None:
     """
     Categorize a patient into one of the 6 failure modes based on their metrics.
 
-    Returns None if the patient doesn't fall into any failure category (e.g., success or TN).
+    Returns the index of the failure mode in CATEGORIES, or None if the patient doesn't
+    fall into any failure category (e.g., success or TN).
     """
-    # L1 False Negative: Positive GT, no issue identified
-    if metrics.positive and metrics.positive_no_issue:
-        return "01_l1_false_negative"
+    pos = metrics.positive
+    neg = metrics.negative
 
-    # L1 False Positive: Negative GT, issue identified
-    if metrics.negative and metrics.negative_any_issue:
-        return "02_l1_false_positive"
-
-    # L2 Issues Incorrect: Positive GT, any issue identified, no correct issues
-    if metrics.positive and metrics.positive_any_issue and metrics.positive_no_correct:
-        return "03_l2_issues_incorrect"
+    # Branches are ordered by observed frequency (see vignette_failure_mode_summary.txt:
+    # L2 partially correct, then L3, then L1) so most patients exit early. The L1/L2
+    # categories are mutually exclusive; L2 Issues Partially Correct must stay ahead of
+    # the L3 checks, which also match partially correct issues.
 
     # L2 Issues Partially Correct: Positive GT, some correct issues
-    if metrics.positive and metrics.positive_some_correct:
-        return "04_l2_issues_partially_correct"
+    if pos and metrics.positive_some_correct:
+        return 3  # 04_l2_issues_partially_correct
 
     # L3 Intervention Partially Correct
-    has_partial_intervention = (
-        metrics.all_correct_partial_intervention or metrics.some_correct_partial_intervention
-    )
-    if has_partial_intervention:
-        return "05_l3_intervention_partially_correct"
+    if metrics.all_correct_partial_intervention or metrics.some_correct_partial_intervention:
+        return 4  # 05_l3_intervention_partially_correct
 
     # L3 Intervention Incorrect
-    has_incorrect_intervention = (
-        metrics.all_correct_incorrect_intervention or metrics.some_correct_incorrect_intervention
-    )
-    if has_incorrect_intervention:
-        return "06_l3_intervention_incorrect"
+    if metrics.all_correct_incorrect_intervention or metrics.some_correct_incorrect_intervention:
+        return 5  # 06_l3_intervention_incorrect
+
+    # L1 False Positive: Negative GT, issue identified
+    if neg and metrics.negative_any_issue:
+        return 1  # 02_l1_false_positive
+
+    # L1 False Negative: Positive GT, no issue identified
+    if pos and metrics.positive_no_issue:
+        return 0  # 01_l1_false_negative
+
+    # L2 Issues Incorrect: Positive GT, any issue identified, no correct issues
+    if pos and metrics.positive_any_issue and metrics.positive_no_correct:
+        return 2  # 03_l2_issues_incorrect
 
     # Not a failure mode (success or true negative)
     return None
 
 
+def is_candidate_failure(clinician_eval: Stage2Data) -> bool:
+    """
+    Cheap pre-filter: True if categorize_patient could return a failure mode.
+
+    Uses only the clinician flags that categorize_patient depends on, without building
+    GroundTruthPerformanceMetrics. False only for true negatives (negative GT, no issue
+    raised) and successes (all issues correct, intervention not partial/incorrect).
+    """
+    assessments = clinician_eval.issue_assessments
+    if not assessments:
+        # No issue raised: L1 false negative if positive GT, otherwise a true negative
+        return clinician_eval.missed_issues == "yes"
+
+    all_correct = all(assessments) and clinician_eval.missed_issues == "no"
+    return not all_correct or clinician_eval.medguard_specific_intervention in ("partial", "no")
+
+
 def get_category_description(category: FailureCategory) -> str:
     """Get a human-readable description for each failure category."""
-    descriptions = {
-        "01_l1_false_negative": "Level 1 False Negative",
-        "02_l1_false_positive": "Level 1 False Positive",
-        "03_l2_issues_incorrect": "Level 2 Issues Incorrect",
-        "04_l2_issues_partially_correct": "Level 2 Issues Partially Correct",
-        "05_l3_intervention_partially_correct": "Level 3 Intervention Partially Correct",
-        "06_l3_intervention_incorrect": "Level 3 Intervention Incorrect",
+    return _CATEGORY_DESCRIPTIONS[category]
+
+
+def _drain_writes(write_queue: "queue.Queue[tuple[Path, str] | None]") -> None:
+    """Write queued (path, text) pairs to disk until a None sentinel is received."""
+    while True:
+        item = write_queue.get()
+        try:
+            if item is None:
+                return
+            path, text = item
+            path.write_text(text, encoding="utf-8")
+        finally:
+            write_queue.task_done()
+
+
+def _process_patient(
+    task: tuple[int, AnalysedPatientRecord, Stage2Data, list[Path]],
+) -> tuple[int, dict[str, str | int], Path, str] | None:
+    """
+    Categorise one patient and, for failure modes, write its HTML vignette.
+
+    Runs in a worker process. Returns the category index and CSV index row together with
+    the markdown path and text (written by the parent's background writer), or None for
+    non-failures.
+    """
+    patient_id, record, clinician_eval, category_dirs = task
+    patient_profile = record.patient
+
+    # If the patient_profile doesn't have a sample date, add it
+    if patient_profile.sample_date is None:
+        patient_profile.sample_date = record.analysis_date
+
+    # Get metrics for this patient
+    metrics = analysis_data_to_performance_metrics(clinician_eval)
+
+    # Categorize patient
+    idx = categorize_patient(metrics)
+
+    if idx is None:
+        # Not a failure mode - skip (success or true negative)
+        return None
+    category = CATEGORIES[idx]
+
+    # Generate vignette with feedback
+    vignette = generate_vignette_with_feedback(
+        patient_profile, record.medguard_analysis, clinician_eval
+    )
+
+    hash16 = vignette.patient_id_hash[:16]
+    cat_dir = category_dirs[idx]
+
+    # Save HTML to appropriate folder
+    html_path = cat_dir / f"{hash16}.html"
+    save_vignette_with_feedback_html(vignette, html_path)
+
+    # Render markdown; the parent queues the write to the appropriate folder
+    md_path = cat_dir / f"{hash16}.md"
+    vignette_md = generate_markdown_from_vignette_with_feedback(vignette)
+
+    # CSV index row (keys match INDEX_FIELDNAMES)
+    row = {
+        "patient_id": patient_id,
+        "patient_id_hash": hash16,
+        "category": category,
+        "description": get_category_description(category),
+        "html_file": f"{category}/{hash16}.html",
+        "markdown_file": f"{category}/{hash16}.md",
     }
-    return descriptions[category]
+    return idx, row, md_path, vignette_md
 
 
 def main():
@@ -120,111 +236,79 @@ def main():
     # Create output directory
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create category directories
-    category_dirs = {
-        "01_l1_false_negative": args.output_dir / "01_l1_false_negative",
-        "02_l1_false_positive": args.output_dir / "02_l1_false_positive",
-        "03_l2_issues_incorrect": args.output_dir / "03_l2_issues_incorrect",
-        "04_l2_issues_partially_correct": args.output_dir / "04_l2_issues_partially_correct",
-        "05_l3_intervention_partially_correct": args.output_dir
-        / "05_l3_intervention_partially_correct",
-        "06_l3_intervention_incorrect": args.output_dir / "06_l3_intervention_incorrect",
-    }
+    # Create category directories, indexed like CATEGORIES
+    category_dirs = [args.output_dir / category for category in CATEGORIES]
 
-    for category_dir in category_dirs.values():
+    for category_dir in category_dirs:
         category_dir.mkdir(parents=True, exist_ok=True)
 
     # Process each patient
-    csv_rows = []
-    category_counts = {cat: 0 for cat in category_dirs.keys()}
+    n_generated = 0
+    category_counts = [0] * len(CATEGORIES)
+
+    # Markdown files are written by a background thread so disk I/O overlaps
+    # with the next patient's processing
+    md_queue: "queue.Queue[tuple[Path, str] | None]" = queue.Queue()
+    md_writer = threading.Thread(target=_drain_writes, args=(md_queue,), daemon=True)
+    md_writer.start()
+
+    # Get data for each patient (guaranteed to exist after filtering)
+    records = evaluation.analysed_records_dict_last
+    clinician_evals = evaluation.clinician_evaluations_dict
+    # Successes and true negatives are dropped up front, before metrics or vignettes are built
+    tasks = [
+        (patient_id, records[patient_id], clinician_evals[patient_id], category_dirs)
+        for patient_id in all_patient_ids
+        if is_candidate_failure(clinician_evals[patient_id])
+    ]
+
+    # CSV index is written row by row, so an interrupted run still leaves a valid file
+    csv_path = args.output_dir / "vignettes_index.csv"
 
+    # Patients are independent, so categorisation and rendering run across worker processes
     print("\nProcessing patients...")
-    for i, patient_id in enumerate(all_patient_ids, 1):
-        if i % 10 == 0:
-            print(f"  Processed {i}/{len(all_patient_ids)} patients...")
-
-        # Get data for this patient (guaranteed to exist after filtering)
-        record = evaluation.analysed_records_dict_last[patient_id]
-        clinician_eval = evaluation.clinician_evaluations_dict[patient_id]
-        patient_profile = record.patient
-
-        # If the patient_profile doesn't have a sample date, add it
-        if patient_profile.sample_date is None:
-            patient_profile.sample_date = record.analysis_date
-
-        # Get metrics for this patient
-        metrics = analysis_data_to_performance_metrics(clinician_eval)
-
-        # Categorize patient
-        category = categorize_patient(metrics)
-
-        if category is None:
-            # Not a failure mode - skip (success or true negative)
-            continue
-
-        # Generate vignette with feedback
-        vignette = generate_vignette_with_feedback(
-            patient_profile, record.medguard_analysis, clinician_eval
-        )
-
-        # Save HTML to appropriate folder
-        html_path = category_dirs[category] / f"{vignette.patient_id_hash[:16]}.html"
-        save_vignette_with_feedback_html(vignette, html_path)
-
-        # Save individual markdown file to appropriate folder
-        md_path = category_dirs[category] / f"{vignette.patient_id_hash[:16]}.md"
-        vignette_md = generate_markdown_from_vignette_with_feedback(vignette)
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(vignette_md)
-
-        # Add to CSV index
-        csv_rows.append(
-            {
-                "patient_id": patient_id,
-                "patient_id_hash": vignette.patient_id_hash[:16],
-                "category": category,
-                "description": get_category_description(category),
-                "html_file": f"{category}/{vignette.patient_id_hash[:16]}.html",
-                "markdown_file": f"{category}/{vignette.patient_id_hash[:16]}.md",
-            }
-        )
-
-        category_counts[category] += 1
-
-    # Save CSV index
-    csv_path = args.output_dir / "vignettes_index.csv"
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "patient_id",
-                "patient_id_hash",
-                "category",
-                "description",
-                "html_file",
-                "markdown_file",
-            ],
-        )
+    with (
+        open(csv_path, "w", newline="") as csv_f,
+        ProcessPoolExecutor(max_workers=os.cpu_count()) as executor,
+    ):
+        writer = csv.DictWriter(csv_f, fieldnames=INDEX_FIELDNAMES)
         writer.writeheader()
-        writer.writerows(csv_rows)
+
+        for i, result in enumerate(executor.map(_process_patient, tasks, chunksize=8), 1):
+            if i % 10 == 0:
+                print(f"  Processed {i}/{len(tasks)} candidate patients...")
+
+            if result is None:
+                continue
+
+            idx, row, md_path, vignette_md = result
+            md_queue.put((md_path, vignette_md))
+            writer.writerow(row)
+            n_generated += 1
+            category_counts[idx] += 1
+
+    # Wait for pending markdown writes, then stop the writer thread
+    md_queue.join()
+    md_queue.put(None)
+    md_writer.join()
 
     # Print summary
     print(f"\n{'=' * 80}")
     print("SUMMARY")
     print(f"{'=' * 80}")
     print(f"Total patients with ground truth (no data errors): {len(all_patient_ids)}")
-    print(f"Failure vignettes generated: {len(csv_rows)}")
-    print(f"Success/True Negative cases (not exported): {len(all_patient_ids) - len(csv_rows)}")
+    print(f"Failure vignettes generated: {n_generated}")
+    print(f"Success/True Negative cases (not exported): {len(all_patient_ids) - n_generated}")
     print()
     print("Breakdown by failure category:")
-    for category, count in category_counts.items():
+    for category, count in zip(CATEGORIES, category_counts):
         if count > 0:
             desc = get_category_description(category)
             print(f"  {category}: {count:3d} - {desc}")
     print()
     print(f"✓ Output directory: {args.output_dir.absolute()}")
     print(f"✓ CSV index: {csv_path.absolute()}")
-    print(f"✓ Generated {len(csv_rows)} HTML and Markdown files (one per patient)")
+    print(f"✓ Generated {n_generated} HTML and Markdown files (one per patient)")
 
 
 if __name__ == "__main__":
@@ -1,63 +1,67 @@
+import io
+import os
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from medguard.evaluation.evaluation import Evaluation, merge_evaluations
-from medguard.utils.parsing import load_pydantic_from_json, save_pydantic_list_to_jsonl
-from medguard.vignette.html_generator import save_vignette_with_feedback_html
+from generate_vignettes import load_evaluation
+
+from medguard.data_ingest.models.patient_profile import PatientProfile
+from medguard.evaluation.clinician.models import Stage2Data
+from medguard.evaluation.evaluation import Evaluation
+from medguard.scorer.models import MedGuardAnalysis
+from medguard.utils.parsing import save_pydantic_list_to_jsonl
+from medguard.vignette.html_generator import generate_html_from_vignette_with_feedback
 from medguard.vignette.models import PatientVignetteWithFeedback
 from medguard.vignette.pipeline import generate_vignette_with_feedback
 
 
-def main():
-    # Load and merge evaluations to get 300 patients
-    print("Loading evaluations...")
-    evaluation_200 = load_pydantic_from_json(
-        Evaluation, "outputs/20251018/test-set/evaluation.json"
-    )
-    evaluation_100 = load_pydantic_from_json(
-        Evaluation, "outputs/20251027/no-filters/evaluation.json"
-    )
-    print(f"   - Loaded {len(evaluation_200.patient_ids())} from test-set")
-    print(f"   - Loaded {len(evaluation_100.patient_ids())} from no-filters")
-
-    evaluation = merge_evaluations([evaluation_100, evaluation_200])
-    print(f"   - Merged: {len(evaluation.patient_ids())} patients total")
-
-    evaluation = evaluation.clean()
-    print(f"   - After cleaning: {len(evaluation.patient_ids())} patients")
+def _generate_one(
+    task: tuple[PatientProfile, MedGuardAnalysis, Stage2Data],
+) -> PatientVignetteWithFeedback:
+    """Build a single vignette with feedback (runs in a worker process)."""
+    return generate_vignette_with_feedback(*task)
 
-    # Get all patient IDs with ground truth
-    all_patient_ids = evaluation.patient_ids()
 
-    vignettes: list[PatientVignetteWithFeedback] = []
+def _render_one(vignette: PatientVignetteWithFeedback) -> bytes:
+    """Render a single vignette to UTF-8 HTML bytes (runs in a worker process)."""
+    return generate_html_from_vignette_with_feedback(vignette).encode("utf-8")
 
-    for patient_id in all_patient_ids:
-        # Get the last analysed record for this patient
-        if patient_id not in evaluation.analysed_records_dict_last:
-            print(f"Skipping patient {patient_id}: no analysed record")
-            continue
 
-        record = evaluation.analysed_records_dict_last[patient_id]
+def write_vignettes_with_feedback(evaluation: Evaluation) -> None:
+    """Generate vignettes with clinician feedback and save them as JSONL and an HTML tar."""
+    # Get all patient IDs with ground truth
+    all_patient_ids = evaluation.patient_ids()
 
-        # Get clinician feedback
-        if patient_id not in evaluation.clinician_evaluations_dict:
-            print(f"Skipping patient {patient_id}: no clinician feedback")
-            continue
+    # Bind the lookups once rather than going through the properties per patient
+    records = evaluation.analysed_records_dict_last
+    feedback = evaluation.clinician_evaluations_dict
 
-        clinician_feedback = evaluation.clinician_evaluations_dict[patient_id]
+    # Eligible patients have an analysed record, clinician feedback and a patient profile
+    with_record_and_feedback = records.keys() & feedback.keys()
+    eligible = [
+        pid for pid in all_patient_ids if pid in with_record_and_feedback and records[pid].patient
+    ]
+    n_skipped = len(all_patient_ids) - len(eligible)
+    if n_skipped:
+        print(f"Skipping {n_skipped} patients without an analysed record, feedback or profile")
 
-        # Get patient profile
-        if not record.patient:
-            print(f"Skipping patient {patient_id}: no patient profile in record")
-            continue
+    # Inputs for each eligible patient; vignettes are built in worker processes below
+    inputs: list[tuple[PatientProfile, MedGuardAnalysis, Stage2Data]] = []
 
+    for patient_id in eligible:
+        record = records[patient_id]
         if not record.patient.sample_date:
             record.patient.sample_date = record.analysis_date
 
-        # Generate vignette with feedback
-        vignette = generate_vignette_with_feedback(
-            record.patient, record.medguard_analysis, clinician_feedback
+        inputs.append((record.patient, record.medguard_analysis, feedback[patient_id]))
+
+    # Generate vignettes with feedback; executor.map keeps patient order
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        vignettes: list[PatientVignetteWithFeedback] = list(
+            executor.map(_generate_one, inputs, chunksize=16)
         )
-        vignettes.append(vignette)
 
     print(f"\n✓ Generated {len(vignettes)} vignettes with feedback")
 
@@ -74,14 +78,33 @@ def main():
     html_dir.mkdir(parents=True, exist_ok=True)
 
     print("\nGenerating HTML files...")
-    for i, vignette in enumerate(vignettes, 1):
-        html_path = html_dir / f"{vignette.patient_id_hash[:16]}.html"
-        save_vignette_with_feedback_html(vignette, html_path)
+    # Vignettes are independent, so rendering runs across worker processes. The HTML is
+    # written into a single tar archive (one file handle) rather than one file per patient.
+    names = [f"{v.patient_id_hash[:16]}.html" for v in vignettes]
+    if len(set(names)) != len(names):
+        raise ValueError("patient_id_hash[:16] collision: two vignettes share an HTML file")
+
+    archive_path = html_dir / "vignettes.tar"
+    mtime = int(time.time())
+    with (
+        tarfile.open(archive_path, "w") as archive,
+        ProcessPoolExecutor(max_workers=os.cpu_count()) as executor,
+    ):
+        rendered = executor.map(_render_one, vignettes, chunksize=8)
+        for i, (name, html) in enumerate(zip(names, rendered), 1):
+            info = tarfile.TarInfo(name)
+            info.size = len(html)
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(html))
+
+            if i % 50 == 0:
+                print(f"  Generated {i}/{len(vignettes)} HTML files...")
+
+    print(f"✓ Saved {len(vignettes)} HTML files to {archive_path}")
 
-        if i % 50 == 0:
-            print(f"  Generated {i}/{len(vignettes)} HTML files...")
 
-    print(f"✓ Saved {len(vignettes)} HTML files to {html_dir}")
+def main():
+    write_vignettes_with_feedback(load_evaluation())
 
 
 if __name__ == "__main__":
@@ -1,29 +1,41 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from medguard.evaluation.evaluation import Evaluation, merge_evaluations
-from medguard.utils.parsing import load_pydantic_from_json, save_pydantic_list_to_jsonl
+from medguard.evaluation.evaluation import (
+    Evaluation,
+    clear_evaluation_cache,
+    load_merged_evaluation_cached,
+)
+from medguard.utils.parsing import save_pydantic_list_to_jsonl
 from medguard.vignette.html_generator import save_vignette_html
+from medguard.vignette.models import PatientVignette
 from medguard.vignette.pipeline import generate_vignette
 
+# Evaluations merged (in this order) into the 300-patient vignette cohort
+EVALUATION_PATHS = [
+    "outputs/20251027/no-filters/evaluation.json",
+    "outputs/20251018/test-set/evaluation.json",
+]
 
-def main():
-    # Load and merge evaluations to get 300 patients
-    print("Loading evaluations...")
-    evaluation_200 = load_pydantic_from_json(
-        Evaluation, "outputs/20251018/test-set/evaluation.json"
-    )
-    evaluation_100 = load_pydantic_from_json(
-        Evaluation, "outputs/20251027/no-filters/evaluation.json"
-    )
-    print(f"   - Loaded {len(evaluation_200.patient_ids())} from test-set")
-    print(f"   - Loaded {len(evaluation_100.patient_ids())} from no-filters")
 
-    evaluation = merge_evaluations([evaluation_100, evaluation_200])
-    print(f"   - Merged: {len(evaluation.patient_ids())} patients total")
+def _render_one(task: tuple[Path, PatientVignette]) -> None:
+    """Render a single vignette to its HTML path (runs in a worker process)."""
+    html_path, vignette = task
+    save_vignette_html(vignette, html_path)
 
-    evaluation = evaluation.clean()
+
+def load_evaluation() -> Evaluation:
+    """Load, merge and clean the vignette cohort (cached across runs and scripts)."""
+    print("Loading evaluations...")
+    evaluation = load_merged_evaluation_cached(EVALUATION_PATHS)
     print(f"   - After cleaning: {len(evaluation.patient_ids())} patients")
+    return evaluation
+
 
+def write_vignettes(evaluation: Evaluation) -> None:
+    """Generate vignettes for every analysed record and save them as JSONL and HTML."""
     print("\nGenerating vignettes...")
     vignettes = []
     for record in evaluation.analysed_records:
@@ -47,15 +59,33 @@ def main():
     html_dir.mkdir(parents=True, exist_ok=True)
 
     print("\nGenerating HTML files...")
-    for i, vignette in enumerate(vignettes, 1):
-        html_path = html_dir / f"{vignette.patient_id_hash[:16]}.html"
-        save_vignette_html(vignette, html_path)
-
-        if i % 50 == 0:
-            print(f"  Generated {i}/{len(vignettes)} HTML files...")
+    # Vignettes are independent, so rendering runs across worker processes
+    tasks = [(html_dir / f"{v.patient_id_hash[:16]}.html", v) for v in vignettes]
+    if len({html_path for html_path, _ in tasks}) != len(tasks):
+        raise ValueError("patient_id_hash[:16] collision: two vignettes share an HTML file")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for i, _ in enumerate(executor.map(_render_one, tasks, chunksize=8), 1):
+            if i % 50 == 0:
+                print(f"  Generated {i}/{len(vignettes)} HTML files...")
 
     print(f"✓ Saved {len(vignettes)} HTML files to {html_dir}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate patient vignettes")
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete cached cleaned evaluations (~/.cache/medguard) before loading; stale "
+        "entries are rebuilt automatically, so this only reclaims space",
+    )
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        print(f"Cleared {clear_evaluation_cache()} cached evaluations")
+
+    write_vignettes(load_evaluation())
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,23 @@
+"""
+Generate both vignette sets from a single load of the evaluation cohort.
+
+Runs generate_vignettes (all analysed records) and generate_vignette_with_analysis
+(patients with clinician feedback) against the same in-memory Evaluation, instead of each
+script loading, merging and cleaning it separately.
+
+Usage:
+    python scripts/generate_vignettes_and_feedback.py
+"""
+
+from generate_vignette_with_analysis import write_vignettes_with_feedback
+from generate_vignettes import load_evaluation, write_vignettes
+
+
+def main():
+    evaluation = load_evaluation()
+    write_vignettes(evaluation)
+    write_vignettes_with_feedback(evaluation)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,10 +17,11 @@ def main():
     parser.add_argument("--all", action="store_true", help="Show all categories with patient IDs")
     args = parser.parse_args()
 
-    # Load CSV
-    df = pl.read_csv(
+    # Scan CSV lazily; only the columns each branch needs are read
+    lf = pl.scan_csv(
         "outputs/failure_vignettes/vignettes_index_annotated.csv", encoding="utf8-lossy"
     )
+    columns = lf.collect_schema().names()
 
     if args.all:
         # Show all categories
@@ -43,31 +44,44 @@ def main():
             "overly-cautious",
         ]
 
-        for cat in categories:
-            if cat in df.columns:
-                patients = (
-                    df.filter(pl.col(cat) == "Y")
-                    .select("patient_id_hash")["patient_id_hash"]
-                    .to_list()
-                )
-                if patients:
-                    print(f"\n{cat} (n={len(patients)}):")
-                    for p in patients:
-                        print(f"  {p}")
+        # One unpivot + group_by collects the "Y" patients of every category column
+        present = [cat for cat in categories if cat in columns]
+        grouped = (
+            lf.unpivot(
+                on=present,
+                index="patient_id_hash",
+                variable_name="category",
+                value_name="flag",
+            )
+            .filter(pl.col("flag") == "Y")
+            .group_by("category", maintain_order=True)
+            .agg(pl.col("patient_id_hash"))
+            .collect(engine="streaming")
+        )
+        patients_by_category = dict(grouped.iter_rows())
+
+        for cat in present:
+            patients = patients_by_category.get(cat)
+            if patients:
+                print(f"\n{cat} (n={len(patients)}):")
+                for p in patients:
+                    print(f"  {p}")
     else:
         if not args.category:
             print("Error: Must specify --category or --all")
             return
 
-        if args.category not in df.columns:
+        if args.category not in columns:
             print(f"Error: Category '{args.category}' not found")
             print(
-                f"Available categories: {[c for c in df.columns if c not in ['patient_id_hash', 'failure_mode', 'level', 'dataset', 'category', 'description', 'Count']]}"
+                f"Available categories: {[c for c in columns if c not in ['patient_id_hash', 'failure_mode', 'level', 'dataset', 'category', 'description', 'Count']]}"
             )
             return
 
-        patients = df.filter(pl.col(args.category) == "Y").select(
-            ["patient_id_hash", "level", "description"]
+        patients = (
+            lf.filter(pl.col(args.category) == "Y")
+            .select(["patient_id_hash", "level", "description"])
+            .collect(engine="streaming")
         )
         print(f"\n{args.category} (n={patients.height}):")
         print(patients)
@@ -15,7 +15,6 @@ from medguard.evaluation.performance_metrics.ground_truth.performance_metrics im
     clinician_evaluations_to_performance_metrics,
 )
 import polars as pl
-import pandas as pd
 
 # Load evaluation
 evaluation = load_pydantic_from_json(Evaluation, "outputs/20251018/test-set/evaluation.json")
@@ -29,14 +28,19 @@ print()
 print("SAMPLE SIZES")
 print("-" * 80)
 print(f"Total clinician evaluations: {len(evaluation.clinician_evaluations)}")
-eval_no_errors = evaluation.exclude_data_errors()
-print(f"After excluding data errors: {len(eval_no_errors.clinician_evaluations)}")
+# Only the clinician evaluations are needed, so select them by id rather than building a
+# filtered Evaluation (which reloads profiles and logs and recomputes every metric)
+no_error_ids = evaluation.filter_by_clinician_evaluation(lambda x: x.data_error is False)
+clinician_evaluations_no_errors = [
+    evaluation.clinician_evaluations_dict[pid] for pid in no_error_ids
+]
+print(f"After excluding data errors: {len(clinician_evaluations_no_errors)}")
 print()
 
 # Ground Truth Binary Metrics
 print("GROUND TRUTH BINARY METRICS (System vs Expert)")
 print("-" * 80)
-metrics = clinician_evaluations_to_performance_metrics(eval_no_errors.clinician_evaluations)
+metrics = clinician_evaluations_to_performance_metrics(clinician_evaluations_no_errors)
 print(f"TP (System+, Expert+): {metrics.positive_any_issue}")
 print(f"FP (System+, Expert-): {metrics.positive_no_issue}")
 print(f"TN (System-, Expert-): {metrics.negative_no_issue}")
@@ -51,19 +55,25 @@ print()
 # PINCER vs Expert Contingency
 print("PINCER vs EXPERT CONTINGENCY")
 print("-" * 80)
-contingency = pd.read_csv("outputs/eval_analyses/expert_pincer_contingency.csv")
-pincer_pos_expert_yes = int(
-    contingency[contingency["metric"] == "True Agreement (TP)"]["count"].iloc[0]
-)
-pincer_pos_expert_no = int(
-    contingency[contingency["metric"] == "False Positive (FP)"]["count"].iloc[0]
-)
-pincer_neg_expert_yes = int(
-    contingency[contingency["metric"] == "False Negative (FN)"]["count"].iloc[0]
-)
-pincer_neg_expert_no = int(
-    contingency[contingency["metric"] == "True Agreement (TN)"]["count"].iloc[0]
+contingency = pl.read_csv("outputs/eval_analyses/expert_pincer_contingency.csv")
+counts = dict(
+    contingency.filter(
+        pl.col("metric").is_in(
+            [
+                "True Agreement (TP)",
+                "False Positive (FP)",
+                "False Negative (FN)",
+                "True Agreement (TN)",
+            ]
+        )
+    )
+    .select(["metric", "count"])
+    .iter_rows()
 )
+pincer_pos_expert_yes = counts["True Agreement (TP)"]
+pincer_pos_expert_no = counts["False Positive (FP)"]
+pincer_neg_expert_yes = counts["False Negative (FN)"]
+pincer_neg_expert_no = counts["True Agreement (TN)"]
 
 print(f"PINCER+, Expert+: {pincer_pos_expert_yes}")
 print(f"PINCER+, Expert-: {pincer_pos_expert_no}")
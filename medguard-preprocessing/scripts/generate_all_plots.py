@@ -1,110 +1,122 @@
-"""Generate all statistical plots from saved CSV data.
+"""Generate all statistical plots from saved analysis outputs.
 
 This script regenerates all publication-quality plots for the paper.
-No database connection required - works from saved CSV files.
+No database connection required - works from the saved parquet files, or the
+tracked CSV exports where no parquet file exists.
+
+Usage:
+    python scripts/generate_all_plots.py [--draft]
+
+Pass --draft for quick low-resolution previews while iterating on plots.
 """
 
-from medguard.analysis.smr_medication_change_contingency import (
-    SMRMedicationChangeContingencyAnalysis,
-)
-from medguard.analysis.smr_time_window_sensitivity import (
-    SMRTimeWindowSensitivityAnalysis,
-)
-from medguard.analysis.smr_time_to_medication_change import (
-    SMRTimeToMedicationChangeAnalysis,
-    SMRTimeToMedicationChangeRawDataAnalysis,
-)
-from medguard.analysis.active_medications_per_patient_distribution import (
-    ActiveMedicationsPerPatientDistributionAnalysis,
-    ActiveMedicationsPerElderlyPatientDistributionAnalysis,
-)
-from medguard.analysis.elderly_patients_medication_counts import (
-    ElderlyPatientsMedicationCountsAnalysis,
-)
-from medguard.analysis.gp_events_per_patient_histogram import (
-    GPEventsPerPatientBinnedSince2020Analysis,
-)
-from medguard.analysis.imd_distribution import (
-    IMDDecilesAnalysis,
-    IMDPercentilesPlotAnalysis,
-)
-from medguard.analysis.pincer_filter_statistics import (
-    PincerFilterSummaryAnalysis,
-    PincerFilterMultipleMatchesAnalysis,
-)
+import argparse
+import importlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Plots are only written to file: pin the non-interactive Agg backend (inherited by the
+# workers) so matplotlib skips GUI backend probing, unless the caller chose one
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+# (title, module, analysis class) per plot; each reads its own saved output, so all are
+# independent. Modules are imported by name inside the workers, so the parent process
+# never pays for the analysis imports (matplotlib, scipy, ...).
+TASKS = [
+    (
+        "SMR Medication Change Contingency",
+        "medguard.analysis.smr_medication_change_contingency",
+        "SMRMedicationChangeContingencyAnalysis",
+    ),
+    (
+        "SMR Time Window Sensitivity",
+        "medguard.analysis.smr_time_window_sensitivity",
+        "SMRTimeWindowSensitivityAnalysis",
+    ),
+    (
+        "SMR Time to Medication Change Summary",
+        "medguard.analysis.smr_time_to_medication_change",
+        "SMRTimeToMedicationChangeAnalysis",
+    ),
+    (
+        "SMR Time to Medication Change Raw Data",
+        "medguard.analysis.smr_time_to_medication_change",
+        "SMRTimeToMedicationChangeRawDataAnalysis",
+    ),
+    (
+        "Active Medications Per Patient Distribution",
+        "medguard.analysis.active_medications_per_patient_distribution",
+        "ActiveMedicationsPerPatientDistributionAnalysis",
+    ),
+    (
+        "Active Medications Per Elderly Patient Distribution",
+        "medguard.analysis.active_medications_per_patient_distribution",
+        "ActiveMedicationsPerElderlyPatientDistributionAnalysis",
+    ),
+    (
+        "Elderly Patients Medication Counts",
+        "medguard.analysis.elderly_patients_medication_counts",
+        "ElderlyPatientsMedicationCountsAnalysis",
+    ),
+    (
+        "GP Events Per Patient (Since 2020)",
+        "medguard.analysis.gp_events_per_patient_histogram",
+        "GPEventsPerPatientBinnedSince2020Analysis",
+    ),
+    (
+        "IMD Deciles Distribution",
+        "medguard.analysis.imd_distribution",
+        "IMDDecilesAnalysis",
+    ),
+    (
+        "IMD Percentiles Distribution",
+        "medguard.analysis.imd_distribution",
+        "IMDPercentilesPlotAnalysis",
+    ),
+    (
+        "PINCER Filter Summary",
+        "medguard.analysis.pincer_filter_statistics",
+        "PincerFilterSummaryAnalysis",
+    ),
+    (
+        "PINCER Filter Multiple Matches",
+        "medguard.analysis.pincer_filter_statistics",
+        "PincerFilterMultipleMatchesAnalysis",
+    ),
+]
+
+
+def _run(module_name: str, class_name: str, draft: bool = False) -> list[Path]:
+    """Generate one analysis's plot(s) from its saved output (runs in a worker process)."""
+    analysis_class = getattr(importlib.import_module(module_name), class_name)
+    output = analysis_class(processor=None).run_figure(draft=draft)
+    return output if isinstance(output, list) else [output]
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate all statistical plots")
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Save low-resolution figures without tight bounding boxes (faster)",
+    )
+    args = parser.parse_args()
+
     print("Generating all statistical plots...")
     print("=" * 60)
 
-    # SMR analyses
-    print("\n1. SMR Medication Change Contingency...")
-    analysis = SMRMedicationChangeContingencyAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    print("\n2. SMR Time Window Sensitivity...")
-    analysis = SMRTimeWindowSensitivityAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    print("\n3. SMR Time to Medication Change Summary...")
-    analysis = SMRTimeToMedicationChangeAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    print("\n4. SMR Time to Medication Change Raw Data...")
-    analysis = SMRTimeToMedicationChangeRawDataAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    # Medication distribution analyses
-    print("\n5. Active Medications Per Patient Distribution...")
-    analysis = ActiveMedicationsPerPatientDistributionAnalysis(processor=None)
-    outputs = analysis.run_figure()
-    for output in outputs:
-        print(f"   ✓ Saved to: {output}")
-
-    print("\n6. Active Medications Per Elderly Patient Distribution...")
-    analysis = ActiveMedicationsPerElderlyPatientDistributionAnalysis(processor=None)
-    outputs = analysis.run_figure()
-    for output in outputs:
-        print(f"   ✓ Saved to: {output}")
-
-    print("\n7. Elderly Patients Medication Counts...")
-    analysis = ElderlyPatientsMedicationCountsAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    # GP events
-    print("\n8. GP Events Per Patient (Since 2020)...")
-    analysis = GPEventsPerPatientBinnedSince2020Analysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    # IMD analyses
-    print("\n9. IMD Deciles Distribution...")
-    analysis = IMDDecilesAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    print("\n10. IMD Percentiles Distribution...")
-    analysis = IMDPercentilesPlotAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
-
-    # PINCER analyses
-    print("\n11. PINCER Filter Summary...")
-    analysis = PincerFilterSummaryAnalysis(processor=None)
-    outputs = analysis.run_figure()
-    for output in outputs:
-        print(f"   ✓ Saved to: {output}")
-
-    print("\n12. PINCER Filter Multiple Matches...")
-    analysis = PincerFilterMultipleMatchesAnalysis(processor=None)
-    output = analysis.run_figure()
-    print(f"   ✓ Saved to: {output}")
+    # Plots are rendered concurrently and reported as each one finishes
+    with ProcessPoolExecutor() as executor:
+        futures = {
+            executor.submit(_run, module_name, class_name, args.draft): (i, title)
+            for i, (title, module_name, class_name) in enumerate(TASKS, 1)
+        }
+        for future in as_completed(futures):
+            i, title = futures[future]
+            print(f"\n{i}. {title}...")
+            for output in future.result():
+                print(f"   ✓ Saved to: {output}")
 
     print("\n" + "=" * 60)
     print("✓ All plots generated successfully!")
@@ -2,10 +2,18 @@
 Script to run all paper statistics analyses.
 
 Usage:
-    python scripts/run_statistics_analyses.py
+    python scripts/run_statistics_analyses.py [--force] [--clear-cache]
+
+Analyses whose saved output is still current are loaded rather than rerun (see
+AnalysisBase.run); pass --force to rerun all of them. --clear-cache deletes the
+persisted query results in outputs/.cache first (see clear_query_cache).
 """
 
+import argparse
 import logging
+from pathlib import Path
+
+import polars as pl
 
 from medguard.analysis.data_completeness_gp_events import (
     DataCompletenessGPEventsAnalysis,
@@ -54,6 +62,7 @@ from medguard.analysis.smr_medication_change_contingency import (
 from medguard.analysis.smr_time_window_sensitivity import (
     SMRTimeWindowSensitivityAnalysis,
 )
+from medguard.analysis.base import AnalysisBase, clear_query_cache
 from medguard.analysis.total_patients import TotalPatientsAnalysis
 from medguard.data_processor import ModularPatientDataProcessor
 
@@ -63,9 +72,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Analyses are independent, so they run concurrently (each worker thread queries
+# through its own DuckDB cursor, see ModularPatientDataProcessor.conn)
+MAX_WORKERS = 8
+
+
+def summarise_result(
+    analysis: AnalysisBase, outcome: tuple[pl.DataFrame, Path] | Exception
+) -> dict:
+    """Log one analysis outcome from run_many, returning its summary or error."""
+    if isinstance(outcome, Exception):
+        logger.error(f"  ✗ {analysis.name} failed: {outcome}")
+        return {"error": str(outcome)}
+
+    df, output_path = outcome
+    logger.info(
+        f"  ✓ {analysis.name} saved to {output_path} "
+        f"({len(df)} rows, {len(df.columns)} cols)"
+    )
+    return {
+        "df": df,
+        "path": output_path,
+        "rows": len(df),
+        "cols": len(df.columns),
+    }
+
 
 def main():
     """Run all statistics analyses."""
+    parser = argparse.ArgumentParser(description="Run all paper statistics analyses")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun every analysis, even if its saved output is current",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete the persisted query results in outputs/.cache before running",
+    )
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        logger.info(f"Cleared {clear_query_cache()} cached query results")
 
     logger.info("Initializing ModularPatientDataProcessor...")
     processor = ModularPatientDataProcessor(
@@ -110,29 +159,24 @@ def main():
         SMRTimeToMedicationChangeRawDataAnalysis(processor),
         SMRTimeToFirstMedicationChangeRawDataAnalysis(processor),
         SMRMedicationChangeContingencyAnalysis(processor),
+    ]
+
+    # Rewrites the shared SMRMedications table per window, so it runs on its own
+    # after the analyses that read that table
+    serial_analyses = [
         SMRTimeWindowSensitivityAnalysis(processor),
     ]
 
-    logger.info(f"Running {len(analyses)} analyses...")
+    logger.info(f"Running {len(analyses) + len(serial_analyses)} analyses...")
 
-    # Run each analysis
+    # Errors are returned rather than raised, so one failure doesn't stop the rest
     results = {}
-    for analysis in analyses:
-        try:
-            logger.info(f"Running {analysis.name}...")
-            df, output_path = analysis.run()
-            results[analysis.name] = {
-                "df": df,
-                "path": output_path,
-                "rows": len(df),
-                "cols": len(df.columns),
-            }
-            logger.info(
-                f"  ✓ Saved to {output_path} ({len(df)} rows, {len(df.columns)} cols)"
-            )
-        except Exception as e:
-            logger.error(f"  ✗ Failed: {e}")
-            results[analysis.name] = {"error": str(e)}
+    for batch, max_workers in ((analyses, MAX_WORKERS), (serial_analyses, 1)):
+        outcomes = AnalysisBase.run_many(
+            batch, force=args.force, max_workers=max_workers, return_exceptions=True
+        )
+        for analysis, outcome in zip(batch, outcomes):
+            results[analysis.name] = summarise_result(analysis, outcome)
 
     # Summary
     logger.info("\n" + "=" * 80)
@@ -142,8 +186,8 @@ def main():
     successful = [name for name, result in results.items() if "error" not in result]
     failed = [name for name, result in results.items() if "error" in result]
 
-    logger.info(f"Successful: {len(successful)}/{len(analyses)}")
-    logger.info(f"Failed: {len(failed)}/{len(analyses)}")
+    logger.info(f"Successful: {len(successful)}/{len(results)}")
+    logger.info(f"Failed: {len(failed)}/{len(results)}")
 
     if failed:
         logger.info("\nFailed analyses:")
@@ -12,105 +12,70 @@ Usage:
     processor = ModularPatientDataProcessor()
     analysis = TotalPatientsAnalysis(processor)
     df, output_path = analysis.run()
-"""
-
-from medguard.analysis.base import AnalysisBase
-
-# Section 2.2: Data Source and Population
-from medguard.analysis.total_patients import TotalPatientsAnalysis
-from medguard.analysis.gp_events_date_range import GPEventsDateRangeAnalysis
-from medguard.analysis.gp_events_per_patient_overall import (
-    GPEventsPerPatientOverallAnalysis,
-)
-from medguard.analysis.gp_events_per_patient_since_2020 import (
-    GPEventsPerPatientSince2020Analysis,
-)
-from medguard.analysis.data_completeness_gp_events import (
-    DataCompletenessGPEventsAnalysis,
-)
-
-# Histogram analyses
-from medguard.analysis.gp_events_per_patient_histogram import (
-    GPEventsPerPatientHistogramOverallAnalysis,
-    GPEventsPerPatientHistogramSince2020Analysis,
-    GPEventsPerPatientBinnedOverallAnalysis,
-    GPEventsPerPatientBinnedSince2020Analysis,
-)
-
-# Elderly patients and polypharmacy
-from medguard.analysis.elderly_patients_medication_counts import (
-    ElderlyPatientsMedicationCountsAnalysis,
-    ElderlyPatientsMedicationCountsDetailedAnalysis,
-)
-
-# Active medication distributions
-from medguard.analysis.active_medications_per_patient_distribution import (
-    ActiveMedicationsPerPatientDistributionAnalysis,
-    ActiveMedicationsPerElderlyPatientDistributionAnalysis,
-)
-
-# IMD distribution
-from medguard.analysis.imd_distribution import (
-    IMDHistogramAnalysis,
-    IMDSummaryStatisticsAnalysis,
-    IMDDecilesAnalysis,
-    IMDCompletenessAnalysis,
-)
 
-# PINCER filter statistics
-from medguard.analysis.pincer_filter_statistics import (
-    PincerFilterRawMatchesAnalysis,
-    PincerFilterSummaryAnalysis,
-    PincerFilterMultipleMatchesAnalysis,
-)
+Analysis classes are imported lazily (PEP 562) on first attribute access, so importing
+one analysis module does not import all of them (and matplotlib, scipy, ...).
+"""
 
-# SMR analysis
-from medguard.analysis.smr_time_to_medication_change import (
-    SMRTimeToMedicationChangeAnalysis,
-    SMRTimeToFirstMedicationChangeAnalysis,
-    SMRTimeToMedicationChangeRawDataAnalysis,
-    SMRTimeToFirstMedicationChangeRawDataAnalysis,
-)
-from medguard.analysis.smr_medication_change_contingency import (
-    SMRMedicationChangeContingencyAnalysis,
-)
-from medguard.analysis.smr_time_window_sensitivity import (
-    SMRTimeWindowSensitivityAnalysis,
-)
+import importlib
 
-__all__ = [
-    "AnalysisBase",
+# Exported name -> submodule defining it
+_REGISTRY = {
+    "AnalysisBase": "base",
     # Section 2.2: Data Source and Population
-    "TotalPatientsAnalysis",
-    "GPEventsDateRangeAnalysis",
-    "GPEventsPerPatientOverallAnalysis",
-    "GPEventsPerPatientSince2020Analysis",
-    "DataCompletenessGPEventsAnalysis",
+    "TotalPatientsAnalysis": "total_patients",
+    "GPEventsDateRangeAnalysis": "gp_events_date_range",
+    "GPEventsPerPatientOverallAnalysis": "gp_events_per_patient_overall",
+    "GPEventsPerPatientSince2020Analysis": "gp_events_per_patient_since_2020",
+    "DataCompletenessGPEventsAnalysis": "data_completeness_gp_events",
     # Histograms
-    "GPEventsPerPatientHistogramOverallAnalysis",
-    "GPEventsPerPatientHistogramSince2020Analysis",
-    "GPEventsPerPatientBinnedOverallAnalysis",
-    "GPEventsPerPatientBinnedSince2020Analysis",
+    "GPEventsPerPatientHistogramOverallAnalysis": "gp_events_per_patient_histogram",
+    "GPEventsPerPatientHistogramSince2020Analysis": "gp_events_per_patient_histogram",
+    "GPEventsPerPatientBinnedOverallAnalysis": "gp_events_per_patient_histogram",
+    "GPEventsPerPatientBinnedSince2020Analysis": "gp_events_per_patient_histogram",
     # Elderly patients / polypharmacy
-    "ElderlyPatientsMedicationCountsAnalysis",
-    "ElderlyPatientsMedicationCountsDetailedAnalysis",
+    "ElderlyPatientsMedicationCountsAnalysis": "elderly_patients_medication_counts",
+    "ElderlyPatientsMedicationCountsDetailedAnalysis": (
+        "elderly_patients_medication_counts"
+    ),
     # Active medication distributions
-    "ActiveMedicationsPerPatientDistributionAnalysis",
-    "ActiveMedicationsPerElderlyPatientDistributionAnalysis",
+    "ActiveMedicationsPerPatientDistributionAnalysis": (
+        "active_medications_per_patient_distribution"
+    ),
+    "ActiveMedicationsPerElderlyPatientDistributionAnalysis": (
+        "active_medications_per_patient_distribution"
+    ),
     # IMD distribution
-    "IMDHistogramAnalysis",
-    "IMDSummaryStatisticsAnalysis",
-    "IMDDecilesAnalysis",
-    "IMDCompletenessAnalysis",
+    "IMDHistogramAnalysis": "imd_distribution",
+    "IMDSummaryStatisticsAnalysis": "imd_distribution",
+    "IMDDecilesAnalysis": "imd_distribution",
+    "IMDCompletenessAnalysis": "imd_distribution",
     # PINCER filter statistics
-    "PincerFilterRawMatchesAnalysis",
-    "PincerFilterSummaryAnalysis",
-    "PincerFilterMultipleMatchesAnalysis",
+    "PincerFilterRawMatchesAnalysis": "pincer_filter_statistics",
+    "PincerFilterSummaryAnalysis": "pincer_filter_statistics",
+    "PincerFilterMultipleMatchesAnalysis": "pincer_filter_statistics",
     # SMR analysis
-    "SMRTimeToMedicationChangeAnalysis",
-    "SMRTimeToFirstMedicationChangeAnalysis",
-    "SMRTimeToMedicationChangeRawDataAnalysis",
-    "SMRTimeToFirstMedicationChangeRawDataAnalysis",
-    "SMRMedicationChangeContingencyAnalysis",
-    "SMRTimeWindowSensitivityAnalysis",
-]
+    "SMRTimeToMedicationChangeAnalysis": "smr_time_to_medication_change",
+    "SMRTimeToFirstMedicationChangeAnalysis": "smr_time_to_medication_change",
+    "SMRTimeToMedicationChangeRawDataAnalysis": "smr_time_to_medication_change",
+    "SMRTimeToFirstMedicationChangeRawDataAnalysis": "smr_time_to_medication_change",
+    "SMRMedicationChangeContingencyAnalysis": "smr_medication_change_contingency",
+    "SMRTimeWindowSensitivityAnalysis": "smr_time_window_sensitivity",
+}
+
+__all__ = list(_REGISTRY)
+
+
+def __getattr__(name: str):
+    """Import an exported analysis class from its submodule on first access."""
+    if name not in _REGISTRY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{_REGISTRY[name]}"), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
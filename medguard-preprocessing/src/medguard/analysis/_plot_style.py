@@ -0,0 +1,23 @@
+"""
+Publication-quality matplotlib style shared by all analysis plots.
+
+Every plot() uses the same settings, so apply_style() only sets them on its first
+call in a process; later calls are no-ops.
+"""
+
+_DONE = False
+
+
+def apply_style() -> None:
+    """Set the seaborn paper style and font sizes (once per process)."""
+    global _DONE
+    if _DONE:
+        return
+
+    import matplotlib.pyplot as plt
+
+    plt.style.use("seaborn-v0_8-paper")
+    plt.rcParams["font.size"] = 11
+    plt.rcParams["axes.labelsize"] = 12
+    plt.rcParams["axes.titlesize"] = 13
+    _DONE = True
@@ -8,9 +8,10 @@ Section: Paper narrative/descriptive statistics
 Returns: Exact patient counts for each active medication count
 """
 
+import numpy as np
 import polars as pl
-import matplotlib.pyplot as plt
 
+from medguard.analysis._plot_style import apply_style
 from medguard.analysis.base import AnalysisBase
 
 
@@ -18,73 +19,112 @@ from medguard.analysis.base import AnalysisBase
 REFERENCE_DATE = "2025-03-01"
 
 
-SQL_ALL_PATIENTS = """
-WITH patient_base AS (
-    -- All valid patients
-    SELECT
-        pl.PK_Patient_Link_ID,
-        p.Dob
-    FROM {patient_link_view} pl
-    LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
-    WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
-        AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
-),
-active_medications AS (
-    -- Count active medications for each patient on reference date
-    SELECT
-        pb.PK_Patient_Link_ID,
-        COUNT(DISTINCT gp.medication_code) as active_medication_count
-    FROM patient_base pb
-    LEFT JOIN {gp_prescriptions} gp
-        ON pb.PK_Patient_Link_ID = gp.FK_Patient_Link_ID
-        AND gp.medication_start_date <= DATE '{reference_date}'
-        AND (gp.medication_end_date IS NULL OR gp.medication_end_date >= DATE '{reference_date}')
-    GROUP BY pb.PK_Patient_Link_ID
-)
-SELECT
-    active_medication_count,
-    COUNT(*) as patient_count
-FROM active_medications
-GROUP BY active_medication_count
-ORDER BY active_medication_count
-"""
+# Elderly threshold (age in years on the reference date)
+ELDERLY_MIN_AGE = 65
 
+# Fixed subplot margins for the (10, 6) figures, used instead of tight_layout();
+# figures are saved with bbox_inches="tight", which trims any excess
+FIGURE_MARGINS = dict(left=0.1, right=0.98, top=0.92, bottom=0.12)
 
-SQL_ELDERLY = """
-WITH patient_base AS (
-    -- Patients age 65 and above
-    SELECT
-        pl.PK_Patient_Link_ID,
-        p.Dob,
-        DATE_DIFF('year', p.Dob, DATE '{reference_date}') as age
-    FROM {patient_link_view} pl
-    LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
-    WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
-        AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
-        AND p.Dob IS NOT NULL
-        AND DATE_DIFF('year', p.Dob, DATE '{reference_date}') >= 65
-),
-active_medications AS (
-    -- Count active medications for each elderly patient
-    SELECT
-        pb.PK_Patient_Link_ID,
-        COUNT(DISTINCT gp.medication_code) as active_medication_count
-    FROM patient_base pb
-    LEFT JOIN {gp_prescriptions} gp
-        ON pb.PK_Patient_Link_ID = gp.FK_Patient_Link_ID
-        AND gp.medication_start_date <= DATE '{reference_date}'
-        AND (gp.medication_end_date IS NULL OR gp.medication_end_date >= DATE '{reference_date}')
-    GROUP BY pb.PK_Patient_Link_ID
-)
+
+# One row per valid patient with their age on the reference date (bound as a
+# parameter, so the SQL text is the same for both analyses and any date). Active
+# medications are counted in polars (see get_per_patient_df)
+SQL_PATIENT_BASE = """
 SELECT
-    active_medication_count,
-    COUNT(*) as patient_count
-FROM active_medications
-GROUP BY active_medication_count
-ORDER BY active_medication_count
+    pl.PK_Patient_Link_ID,
+    MAX(DATE_DIFF('year', p.Dob, $reference_date::DATE)) as age
+FROM {patient_link_view} pl
+LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
+WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
+    AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
+GROUP BY pl.PK_Patient_Link_ID
 """
 
 
+def get_patient_base_sql(processor) -> str:
+    """Per-patient (PK_Patient_Link_ID, age) query."""
+    return SQL_PATIENT_BASE.format(
+        patient_link_view=processor.default_kwargs["patient_link_view"],
+        patient_view=processor.default_kwargs["patient_view"],
+    )
+
+
+def count_active_medications(
+    patients: pl.DataFrame, prescriptions: pl.DataFrame
+) -> pl.DataFrame:
+    """
+    Add each patient's number of distinct active medications.
+
+    Patients without an active prescription get a count of 0.
+
+    Args:
+        patients: One row per patient (PK_Patient_Link_ID, age)
+        prescriptions: Active medications, one (FK_Patient_Link_ID, medication_code)
+            row each
+
+    Returns:
+        Per-patient (PK_Patient_Link_ID, age, active_medication_count) DataFrame
+    """
+    counts = (
+        prescriptions.lazy()
+        .group_by("FK_Patient_Link_ID")
+        .agg(pl.len().alias("active_medication_count"))
+        .with_columns(
+            pl.col("FK_Patient_Link_ID").cast(patients.schema["PK_Patient_Link_ID"])
+        )
+    )
+    return (
+        patients.lazy()
+        .join(
+            counts,
+            left_on="PK_Patient_Link_ID",
+            right_on="FK_Patient_Link_ID",
+            how="left",
+        )
+        .with_columns(pl.col("active_medication_count").fill_null(0).cast(pl.Int64))
+        .collect()
+    )
+
+
+def get_per_patient_df(analysis: AnalysisBase, patients: pl.DataFrame) -> pl.DataFrame:
+    """
+    Per-patient (PK_Patient_Link_ID, age, active_medication_count) frame.
+
+    Built once per processor and shared by both analyses below, which only differ in
+    the age filter applied to it.
+
+    Args:
+        analysis: Analysis requesting the frame (provides processor and queries)
+        patients: Result of SQL_PATIENT_BASE
+
+    Returns:
+        Per-patient DataFrame
+    """
+    return analysis.processor.get_or_build(
+        f"active_medications_per_patient:{REFERENCE_DATE}",
+        lambda: count_active_medications(
+            patients, analysis.active_prescriptions_df(REFERENCE_DATE)
+        ),
+    )
+
+
+def count_patients_by_active_medications(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Number of patients for each active medication count, ordered by count.
+
+    Counts are small non-negative integers, so they are histogrammed with a single
+    bincount pass; counts that no patient has are dropped.
+    """
+    hist = np.bincount(df["active_medication_count"].to_numpy())
+    return pl.DataFrame(
+        {
+            "active_medication_count": np.arange(hist.size, dtype=np.int64),
+            "patient_count": hist.astype(np.int64),
+        }
+    ).filter(pl.col("patient_count") > 0)
+
+
 class ActiveMedicationsPerPatientDistributionAnalysis(AnalysisBase):
     """Distribution of active medication counts - all patients."""
 
@@ -92,27 +132,14 @@ class ActiveMedicationsPerPatientDistributionAnalysis(AnalysisBase):
         super().__init__(processor, name="active_medications_per_patient_distribution")
 
     def get_sql_statement(self) -> str:
-        return SQL_ALL_PATIENTS.format(
-            reference_date=REFERENCE_DATE,
-            patient_link_view=self.processor.default_kwargs["patient_link_view"],
-            patient_view=self.processor.default_kwargs["patient_view"],
-            gp_prescriptions=self.processor.default_kwargs["gp_prescriptions"],
-        )
+        return get_patient_base_sql(self.processor)
+
+    def get_sql_parameters(self) -> dict:
+        return {"reference_date": REFERENCE_DATE}
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Add cumulative counts and percentiles
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                (pl.col("patient_count") / total_patients * 100)
-                .round(2)
-                .alias("pct_of_patients"),
-                pl.col("patient_count").cum_sum().alias("cumulative_patients"),
-                (pl.col("patient_count").cum_sum() / total_patients * 100)
-                .round(2)
-                .alias("cumulative_pct"),
-            ]
-        )
+        df = count_patients_by_active_medications(get_per_patient_df(self, df))
+        return self._add_cum_and_pct(df, "pct_of_patients")
 
     def plot(self):
         """
@@ -121,20 +148,19 @@ class ActiveMedicationsPerPatientDistributionAnalysis(AnalysisBase):
         Returns:
             List of (figure, suffix) tuples - one linear scale, one log scale
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
-        medication_counts = df["active_medication_count"].to_list()
-        percentages = df["pct_of_patients"].to_list()
+        medication_counts = df["active_medication_count"].to_numpy()
+        percentages = df["pct_of_patients"].to_numpy()
 
-        max_count = max(medication_counts)
+        max_count = medication_counts.max()
         xlim = 20.5 if max_count > 20 else max_count + 0.5
 
         # Create LINEAR scale plot
@@ -154,7 +180,7 @@ class ActiveMedicationsPerPatientDistributionAnalysis(AnalysisBase):
         )
         ax_linear.grid(axis="y", alpha=0.3, linestyle="--")
         ax_linear.set_xlim(-0.5, xlim)
-        fig_linear.tight_layout()
+        fig_linear.subplots_adjust(**FIGURE_MARGINS)
 
         # Create LOG scale plot
         fig_log, ax_log = plt.subplots(figsize=(10, 6))
@@ -176,7 +202,7 @@ class ActiveMedicationsPerPatientDistributionAnalysis(AnalysisBase):
         ax_log.grid(axis="y", alpha=0.3, linestyle="--", which="both")
         ax_log.set_yscale("log")
         ax_log.set_xlim(-0.5, xlim)
-        fig_log.tight_layout()
+        fig_log.subplots_adjust(**FIGURE_MARGINS)
 
         return [(fig_linear, "_linear"), (fig_log, "_log")]
 
@@ -190,27 +216,16 @@ class ActiveMedicationsPerElderlyPatientDistributionAnalysis(AnalysisBase):
         )
 
     def get_sql_statement(self) -> str:
-        return SQL_ELDERLY.format(
-            reference_date=REFERENCE_DATE,
-            patient_link_view=self.processor.default_kwargs["patient_link_view"],
-            patient_view=self.processor.default_kwargs["patient_view"],
-            gp_prescriptions=self.processor.default_kwargs["gp_prescriptions"],
-        )
+        return get_patient_base_sql(self.processor)
+
+    def get_sql_parameters(self) -> dict:
+        return {"reference_date": REFERENCE_DATE}
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Add cumulative counts and percentiles
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                (pl.col("patient_count") / total_patients * 100)
-                .round(2)
-                .alias("pct_of_elderly"),
-                pl.col("patient_count").cum_sum().alias("cumulative_patients"),
-                (pl.col("patient_count").cum_sum() / total_patients * 100)
-                .round(2)
-                .alias("cumulative_pct"),
-            ]
-        )
+        # Patients age 65 and above (patients without a Dob have a null age)
+        df = get_per_patient_df(self, df).filter(pl.col("age") >= ELDERLY_MIN_AGE)
+        df = count_patients_by_active_medications(df)
+        return self._add_cum_and_pct(df, "pct_of_elderly")
 
     def plot(self):
         """
@@ -219,33 +234,44 @@ class ActiveMedicationsPerElderlyPatientDistributionAnalysis(AnalysisBase):
         Returns:
             List of (figure, suffix) tuples - linear, log, and overlay with total population
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df_elderly = self.load_df()
 
         # Load the total population data for comparison
-        from pathlib import Path
-
-        pop_csv = (
-            Path(self.output_dir) / "active_medications_per_patient_distribution.csv"
-        )
-        df_population = pl.read_csv(pop_csv)
+        df_population = self.load_df("active_medications_per_patient_distribution")
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
-        elderly_counts = df_elderly["active_medication_count"].to_list()
-        elderly_pct = df_elderly["pct_of_elderly"].to_list()
-
-        pop_counts = df_population["active_medication_count"].to_list()
-        pop_pct = df_population["pct_of_patients"].to_list()
-
-        max_count = max(max(elderly_counts), max(pop_counts))
+        elderly_counts = df_elderly["active_medication_count"].to_numpy()
+        elderly_pct = df_elderly["pct_of_elderly"].to_numpy()
+
+        pop_counts = df_population["active_medication_count"].to_numpy()
+        pop_pct = df_population["pct_of_patients"].to_numpy()
+
+        # Axis limits shared by all four figures, from one (count, elderly %, population %)
+        # array over the union of counts (percentages are NaN where a count is absent)
+        limits = (
+            df_elderly.select("active_medication_count", "pct_of_elderly")
+            .join(
+                df_population.select("active_medication_count", "pct_of_patients"),
+                on="active_medication_count",
+                how="full",
+                coalesce=True,
+            )
+            .to_numpy()
+            .astype(float)
+        )
+        max_count = limits[:, 0].max()
         xlim = 20.5 if max_count > 20 else max_count + 0.5
 
+        # Max percentage in the 5+ medications range (5 if there is none)
+        pct_5plus = limits[limits[:, 0] >= 5, 1:]
+        max_pct_5plus = np.nanmax(pct_5plus) if pct_5plus.size else 5
+
         # Create LINEAR scale plot (elderly only)
         fig_linear, ax_linear = plt.subplots(figsize=(10, 6))
         ax_linear.bar(
@@ -265,7 +291,7 @@ class ActiveMedicationsPerElderlyPatientDistributionAnalysis(AnalysisBase):
         )
         ax_linear.grid(axis="y", alpha=0.3, linestyle="--")
         ax_linear.set_xlim(-0.5, xlim)
-        fig_linear.tight_layout()
+        fig_linear.subplots_adjust(**FIGURE_MARGINS)
 
         # Create LOG scale plot (elderly only)
         fig_log, ax_log = plt.subplots(figsize=(10, 6))
@@ -289,7 +315,7 @@ class ActiveMedicationsPerElderlyPatientDistributionAnalysis(AnalysisBase):
         ax_log.grid(axis="y", alpha=0.3, linestyle="--", which="both")
         ax_log.set_yscale("log")
         ax_log.set_xlim(-0.5, xlim)
-        fig_log.tight_layout()
+        fig_log.subplots_adjust(**FIGURE_MARGINS)
 
         # Create OVERLAY plot - LINEAR scale (elderly + total population) - Focus on 5+ medications
         fig_overlay, ax_overlay = plt.subplots(figsize=(10, 6))
@@ -327,21 +353,10 @@ class ActiveMedicationsPerElderlyPatientDistributionAnalysis(AnalysisBase):
         ax_overlay.set_xlim(4.5, xlim)  # Start at 5 medications
 
         # Adjust y-axis to fit the 5+ medications data range
-        # Find max percentage in the 5+ range
-        max_pct_5plus = max(
-            [
-                pct
-                for count, pct in zip(
-                    pop_counts + elderly_counts, pop_pct + elderly_pct
-                )
-                if count >= 5
-            ],
-            default=5,
-        )
         ax_overlay.set_ylim(0, max_pct_5plus * 1.15)  # Add 15% padding
 
         ax_overlay.legend(loc="upper right", frameon=True, fancybox=True, shadow=True)
-        fig_overlay.tight_layout()
+        fig_overlay.subplots_adjust(**FIGURE_MARGINS)
 
         # Create OVERLAY plot - LOG scale (elderly + total population)
         fig_overlay_log, ax_overlay_log = plt.subplots(figsize=(10, 6))
@@ -383,7 +398,7 @@ class ActiveMedicationsPerElderlyPatientDistributionAnalysis(AnalysisBase):
         ax_overlay_log.legend(
             loc="upper right", frameon=True, fancybox=True, shadow=True
         )
-        fig_overlay_log.tight_layout()
+        fig_overlay_log.subplots_adjust(**FIGURE_MARGINS)
 
         return [
             (fig_linear, "_linear"),
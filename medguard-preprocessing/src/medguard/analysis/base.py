@@ -6,17 +6,183 @@ Each analysis:
 2. Implements get_sql_statement() to return formatted SQL
 3. Optionally implements post_process_df() for polars transformations
 4. Inherits execute() and save() from base class
+
+Query results are cached by SQL text (see AnalysisBase.query_df) in memory, so
+analyses sharing a query run it once. Aggregate-only queries (persist_query) are also
+kept as parquet under outputs/.cache so reruns skip the database; patient-level
+results never leave memory. run() also skips analyses whose saved output is still
+current. Call clear_query_cache() (or delete outputs/.cache, or call
+run(force=True)) to force a refresh.
 """
 
+import hashlib
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union, List
+from typing import TYPE_CHECKING, Optional, Union, List
 
+import numpy as np
 import polars as pl
-import matplotlib.pyplot as plt
+from numba import njit
 
 from medguard.data_processor import ModularPatientDataProcessor
 
+if TYPE_CHECKING:
+    # pyplot is imported where figures are handled, so statistics-only runs skip it
+    import matplotlib.pyplot as plt
+
+# Worker threads used by run_figure to save the figures of one analysis
+MAX_FIGURE_WORKERS = 4
+
+# Worker threads used by run_many to run independent analyses
+MAX_RUN_WORKERS = 4
+
+# Resolution of draft figures (see save_figure_to_png)
+DRAFT_FIG_DPI = 100
+
+# Rows per batch (and polars chunk) when fetching query results from DuckDB
+QUERY_BATCH_ROWS = 1_000_000
+
+# Medications active on a reference date, deduplicated to one row per
+# (patient, medication) so counting them needs no DISTINCT
+# (see AnalysisBase.active_prescriptions_df)
+ACTIVE_PRESCRIPTIONS_SQL = """
+SELECT DISTINCT
+    FK_Patient_Link_ID,
+    medication_code
+FROM {gp_prescriptions}
+WHERE medication_start_date <= $reference_date::DATE
+    AND (medication_end_date IS NULL OR medication_end_date >= $reference_date::DATE)
+    AND medication_code IS NOT NULL
+"""
+
+
+@njit(cache=True)
+def _cum_pct(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Percentage, running total and running percentage of each count.
+
+    Args:
+        counts: Patient counts (int64)
+
+    Returns:
+        Tuple of (pct, cumulative, cumulative_pct) arrays
+    """
+    # Multiply by the reciprocal, as polars does when dividing by a scalar, so the
+    # rounded percentages match the previous polars implementation exactly. An
+    # empty or all-zero histogram gives NaN percentages (as polars' 0 / 0 did)
+    total = counts.sum()
+    inv_total = 1.0 / total if total != 0 else np.nan
+    pct = np.empty(counts.shape[0])
+    cumulative = np.empty_like(counts)
+    cumulative_pct = np.empty(counts.shape[0])
+
+    running = 0
+    for i in range(counts.shape[0]):
+        running += counts[i]
+        pct[i] = counts[i] * inv_total * 100
+        cumulative[i] = running
+        cumulative_pct[i] = running * inv_total * 100
+
+    return pct, cumulative, cumulative_pct
+
+
+def fetch_polars(result, batch_size: int = QUERY_BATCH_ROWS) -> pl.DataFrame:
+    """
+    Fetch a DuckDB query result as a polars DataFrame with DuckDB's native .pl()
+    export, without going through pandas.
+
+    Each batch of batch_size rows stays a chunk of the frame rather than being
+    copied into one buffer. Columns are given the dtypes the pandas conversion
+    produced, so saved outputs and post_process_df() code are unaffected: DATE
+    becomes Datetime, DECIMAL and HUGEINT (e.g. SUM of integers) become Float64, and
+    float NaN becomes null.
+
+    Args:
+        result: Executed DuckDB connection or cursor
+        batch_size: Rows per batch
+
+    Returns:
+        Polars DataFrame
+    """
+    df = result.pl(batch_size)
+    return df.with_columns(
+        pl.col(pl.Date).cast(pl.Datetime("us")),
+        pl.col(pl.Decimal).cast(pl.Float64),
+        pl.col(pl.Float32, pl.Float64).fill_nan(None),
+    )
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """
+    Hash of the medguard package source (path, size and modification time of each
+    module), so saved outputs are recomputed after code changes.
+    """
+    package_dir = Path(__file__).resolve().parents[1]
+    digest = hashlib.sha1()
+    for path in sorted(package_dir.rglob("*.py")):
+        stat = path.stat()
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def frame_digest(df: pl.DataFrame) -> str:
+    """
+    Hash of a DataFrame's schema and row contents (in order), independent of how
+    its columns are chunked.
+    """
+    digest = hashlib.sha1(f"{pl.__version__}:{df.schema}".encode())
+    digest.update(df.hash_rows(seed=0).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=8)
+def _read_output(path: Path, mtime_ns: int, size: int) -> pl.DataFrame:
+    """
+    Read a saved parquet or CSV output. Memoised on the file's modification time and
+    size as well as its path, so a rewritten file is read again.
+    """
+    if path.suffix == ".parquet":
+        return pl.read_parquet(path)
+    return pl.read_csv(path)
+
+
+def clear_query_cache(cache_dir: Union[str, Path] = "outputs/.cache") -> int:
+    """
+    Delete the query results persisted by AnalysisBase.query_df.
+
+    Cached results are never removed automatically, as a changed query simply gets a
+    new key. This also removes results written before query caching became opt-in,
+    which may hold patient-level rows.
+
+    Args:
+        cache_dir: Query cache folder (outputs/.cache for the default output_dir)
+
+    Returns:
+        Number of files deleted
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        return 0
+    cached = list(cache_dir.glob("*.parquet")) + list(cache_dir.glob("*.tmp"))
+    for path in cached:
+        path.unlink(missing_ok=True)
+    return len(cached)
+
+
+# Frames written by save() in this process, by parquet path, with the file's
+# (mtime_ns, size) once written. load_df serves these while the file is unchanged,
+# so a plot reading an output saved earlier in the run skips the parquet read.
+_saved_outputs: dict[Path, tuple[int, int, pl.DataFrame]] = {}
+
+
+def _remember_output(path: Path, df: pl.DataFrame) -> None:
+    """Record df as the contents of the saved output at path (see load_df)."""
+    stat = path.stat()
+    _saved_outputs[path] = (stat.st_mtime_ns, stat.st_size, df)
+
 
 class AnalysisBase(ABC):
     """
@@ -35,8 +201,27 @@ class AnalysisBase(ABC):
             def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
                 # Optional: add transformations
                 return df
+
+    Results are saved as parquet, which load_df() reads back typed and without
+    parsing, plus a human-readable CSV export (the files tracked in
+    outputs/statistics). Set write_csv = False (on the class or an instance) to skip
+    the CSV.
+
+    Figures are saved at fig_dpi with fig_bbox_inches, which can likewise be set
+    per class or instance.
     """
 
+    # Also export results as CSV next to the parquet file
+    write_csv: bool = True
+
+    # Also cache the query result on disk (see query_df). Only set this when the SQL
+    # returns aggregates, never per-patient rows
+    persist_query: bool = False
+
+    # savefig settings for figures (draft figures use DRAFT_FIG_DPI and no tight bbox)
+    fig_dpi: int = 300
+    fig_bbox_inches: Optional[str] = "tight"
+
     def __init__(
         self,
         processor: ModularPatientDataProcessor,
@@ -60,6 +245,9 @@ class AnalysisBase(ABC):
         self.plots_dir: Path = self.output_dir / "plots"
         self.plots_dir.mkdir(parents=True, exist_ok=True)
 
+        # Persisted query results (outputs/.cache for the default output_dir)
+        self.cache_dir: Path = self.output_dir.parent / ".cache"
+
     @abstractmethod
     def get_sql_statement(self) -> str:
         """
@@ -72,6 +260,18 @@ class AnalysisBase(ABC):
         """
         pass
 
+    def get_sql_parameters(self) -> Optional[dict]:
+        """
+        Return values for named parameters ($name) in the SQL statement.
+
+        Override to bind values such as dates as parameters, keeping the SQL text
+        identical across values. Table names are still formatted into the SQL.
+
+        Returns:
+            Mapping of parameter name to value, or None if the SQL has no parameters
+        """
+        return None
+
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
         """
         Post-process the DataFrame with polars transformations.
@@ -88,6 +288,28 @@ class AnalysisBase(ABC):
         # Default: no transformation
         return df
 
+    def _add_cum_and_pct(self, df: pl.DataFrame, pct_col_name: str) -> pl.DataFrame:
+        """
+        Add percentage and cumulative columns to a histogram of patient counts.
+
+        Shared post-processing for analyses returning one row per bin with a
+        patient_count column, already in bin order.
+
+        Args:
+            df: Histogram with a patient_count column
+            pct_col_name: Name of the percentage-of-total column
+
+        Returns:
+            DataFrame with pct_col_name, cumulative_patients and cumulative_pct added
+        """
+        # Computed in one compiled pass (see _cum_pct)
+        pct, cumulative, cumulative_pct = _cum_pct(df["patient_count"].to_numpy())
+        return df.with_columns(
+            pl.Series(pct_col_name, pct).round(2),
+            pl.Series("cumulative_patients", cumulative),
+            pl.Series("cumulative_pct", cumulative_pct).round(2),
+        )
+
     def execute(self) -> pl.DataFrame:
         """
         Execute the SQL statement and return polars DataFrame.
@@ -97,53 +319,172 @@ class AnalysisBase(ABC):
         """
         sql = self.get_sql_statement()
 
-        # Execute SQL and get pandas DataFrame
-        pandas_df = self.processor.conn.execute(sql).df()
-
-        # Convert to polars DataFrame
-        polars_df = pl.from_pandas(pandas_df)
+        # Execute SQL (or replay a cached result) as a polars DataFrame
+        polars_df = self.query_df(
+            sql, self.get_sql_parameters(), persist=self.persist_query
+        )
 
         # Apply post-processing
         result = self.post_process_df(polars_df)
 
         return result
 
+    def query_df(
+        self, sql: str, parameters: Optional[dict] = None, persist: bool = False
+    ) -> pl.DataFrame:
+        """
+        Execute SQL and return a polars DataFrame, caching the result.
+
+        Results are keyed on the SQL text, its parameters and the processor's data
+        fingerprint and kept on the processor (see
+        ModularPatientDataProcessor.get_or_build). With persist, they are also
+        written to cache_dir/<sha1>.parquet for later runs; only persist aggregate
+        results, so patient-level data is never copied out of the data folder.
+
+        Args:
+            sql: SQL query string
+            parameters: Values for named parameters ($name) in the SQL
+            persist: Also cache the result on disk (aggregate results only)
+
+        Returns:
+            Polars DataFrame with query results
+        """
+        key = hashlib.sha1(
+            f"{self.processor.data_fingerprint}\n{sql}\n{parameters}".encode()
+        ).hexdigest()
+        cache_path = self.cache_dir / f"{key}.parquet"
+
+        def build() -> pl.DataFrame:
+            if persist and cache_path.exists():
+                return pl.read_parquet(cache_path)
+
+            # Execute SQL and fetch the result straight into polars
+            df = fetch_polars(self.processor.conn.execute(sql, parameters))
+
+            if persist:
+                # Write then rename, so an interrupted run never leaves a partial file
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_suffix(".tmp")
+                df.write_parquet(tmp_path)
+                tmp_path.replace(cache_path)
+            return df
+
+        return self.processor.get_or_build(f"query:{key}", build)
+
+    def active_prescriptions_df(self, reference_date: str) -> pl.DataFrame:
+        """
+        Prescriptions active on a reference date.
+
+        Read through query_df, so analyses using the same reference date share a
+        single read of the prescriptions table. Kept in memory only, as the rows are
+        per patient.
+
+        Args:
+            reference_date: Date as YYYY-MM-DD
+
+        Returns:
+            Polars DataFrame with one (FK_Patient_Link_ID, medication_code) row per
+            active medication
+        """
+        return self.query_df(
+            ACTIVE_PRESCRIPTIONS_SQL.format(
+                gp_prescriptions=self.processor.default_kwargs["gp_prescriptions"]
+            ),
+            {"reference_date": reference_date},
+        )
+
+    def output_path(self, name: Optional[str] = None, suffix: str = ".parquet") -> Path:
+        """
+        Path of a saved result in output_dir.
+
+        Args:
+            name: Analysis name (defaults to this analysis)
+            suffix: ".parquet" (the canonical output) or ".csv" (the export)
+
+        Returns:
+            Path to the output file
+        """
+        if suffix not in (".parquet", ".csv"):
+            raise ValueError(f"Unknown output suffix: {suffix}")
+
+        return self.output_dir / f"{name or self.name}{suffix}"
+
     def save(self, df: Optional[pl.DataFrame] = None) -> Path:
         """
-        Save DataFrame to CSV file.
+        Save DataFrame to a parquet file, and a CSV export unless write_csv is False.
+
+        Files already holding the same contents (per the digest recorded in
+        cache_dir/<name>.hash) are left untouched rather than rewritten.
 
         Args:
             df: DataFrame to save. If None, executes query first.
 
         Returns:
-            Path to saved CSV file
+            Path to saved parquet file
         """
         if df is None:
             df = self.execute()
 
-        output_path = self.output_dir / f"{self.name}.csv"
-        df.write_csv(output_path)
-
+        output_path = self.output_path()
+        csv_path = self.output_path(suffix=".csv")
+        digest = f"{frame_digest(df)}:{self.write_csv}"
+        digest_path = self.cache_dir / f"{self.name}.hash"
+
+        if (
+            output_path.exists()
+            and (not self.write_csv or csv_path.exists())
+            and digest_path.exists()
+            and digest_path.read_text() == digest
+        ):
+            _remember_output(output_path, df)
+            return output_path
+
+        df.write_parquet(
+            output_path, compression="zstd", compression_level=3, statistics=True
+        )
+        if self.write_csv:
+            df.write_csv(csv_path)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        digest_path.write_text(digest)
+
+        _remember_output(output_path, df)
         return output_path
 
-    def load_df(self) -> pl.DataFrame:
+    def load_df(self, name: Optional[str] = None) -> pl.DataFrame:
         """
-        Load DataFrame from saved CSV file.
+        Load DataFrame from a saved parquet file, or its CSV export if there is none
+        (e.g. the CSVs tracked in outputs/statistics on a fresh checkout).
+
+        Args:
+            name: Analysis whose output to load (defaults to this analysis), e.g. to
+                compare against a related analysis in plot()
 
         Returns:
-            Polars DataFrame loaded from CSV
+            Polars DataFrame loaded from file
 
         Raises:
-            FileNotFoundError: If CSV file does not exist
+            FileNotFoundError: If neither file exists
         """
-        csv_path = self.output_dir / f"{self.name}.csv"
-
-        if not csv_path.exists():
-            raise FileNotFoundError(f"CSV file not found: {csv_path}")
-
-        return pl.read_csv(csv_path)
-
-    def plot(self) -> Optional[Union[plt.Figure, List[plt.Figure]]]:
+        path = self.output_path(name)
+        if not path.exists():
+            csv_path = self.output_path(name, suffix=".csv")
+            if not csv_path.exists():
+                raise FileNotFoundError(
+                    f"Output file not found: {path} (or {csv_path})"
+                )
+            path = csv_path
+
+        # Outputs saved earlier in this process, and repeated loads (e.g. a plot
+        # reading another analysis's output), reuse the in-memory frame until the
+        # file changes; clone so callers cannot mutate it
+        stat = path.stat()
+        saved = _saved_outputs.get(path)
+        if saved is not None and saved[:2] == (stat.st_mtime_ns, stat.st_size):
+            return saved[2].clone()
+        return _read_output(path, stat.st_mtime_ns, stat.st_size).clone()
+
+    def plot(self) -> Optional[Union["plt.Figure", List["plt.Figure"]]]:
         """
         Create visualization(s) from saved data.
 
@@ -156,13 +497,22 @@ class AnalysisBase(ABC):
         # Default: no plot implementation
         return None
 
-    def save_figure_to_png(self, fig: plt.Figure, suffix: str = "") -> Path:
+    def save_figure_to_png(
+        self,
+        fig: "plt.Figure",
+        suffix: str = "",
+        close: bool = True,
+        draft: bool = False,
+    ) -> Path:
         """
         Save matplotlib figure to PNG file.
 
         Args:
             fig: Matplotlib figure to save
             suffix: Optional suffix to add to filename (e.g., "_histogram")
+            close: Close the figure after saving (pyplot state, main thread only)
+            draft: Save quickly for iteration: DRAFT_FIG_DPI and no tight bbox (which
+                needs an extra render pass)
 
         Returns:
             Path to saved PNG file
@@ -173,12 +523,20 @@ class AnalysisBase(ABC):
             filename = f"{self.name}.png"
 
         output_path = self.plots_dir / filename
-        fig.savefig(output_path, dpi=300, bbox_inches="tight")
-        plt.close(fig)
+        if draft:
+            fig.savefig(output_path, dpi=DRAFT_FIG_DPI, bbox_inches=None)
+        else:
+            fig.savefig(output_path, dpi=self.fig_dpi, bbox_inches=self.fig_bbox_inches)
+        if close:
+            import matplotlib.pyplot as plt
+
+            plt.close(fig)
 
         return output_path
 
-    def run_figure(self, suffix: str = "") -> Optional[Union[Path, List[Path]]]:
+    def run_figure(
+        self, suffix: str = "", draft: bool = False
+    ) -> Optional[Union[Path, List[Path]]]:
         """
         Generate plot(s) and save to PNG.
 
@@ -186,6 +544,7 @@ class AnalysisBase(ABC):
 
         Args:
             suffix: Optional suffix to add to filename (only used if plot() returns single figure)
+            draft: Save draft-quality figures (see save_figure_to_png)
 
         Returns:
             Path to saved PNG file, list of paths, or None if plotting not implemented
@@ -195,37 +554,127 @@ class AnalysisBase(ABC):
         if result is None:
             return None
 
+        import matplotlib.pyplot as plt
+
         # Handle single figure
         if isinstance(result, plt.Figure):
-            path = self.save_figure_to_png(result, suffix=suffix)
+            path = self.save_figure_to_png(result, suffix=suffix, draft=draft)
             return path
 
         # Handle list of (figure, suffix) tuples
         if isinstance(result, list):
-            paths = []
-            for item in result:
-                if isinstance(item, tuple) and len(item) == 2:
-                    fig, fig_suffix = item
-                    path = self.save_figure_to_png(fig, suffix=fig_suffix)
-                    paths.append(path)
-                else:
-                    # Just a figure without suffix
-                    path = self.save_figure_to_png(item, suffix=suffix)
-                    paths.append(path)
+            # Normalise to (figure, suffix); a bare figure uses the given suffix
+            figures = [
+                item if isinstance(item, tuple) and len(item) == 2 else (item, suffix)
+                for item in result
+            ]
+
+            # Figures are independent, so they are rendered and written concurrently;
+            # they are closed afterwards here, as pyplot's figure registry is global
+            with ThreadPoolExecutor(max_workers=MAX_FIGURE_WORKERS) as executor:
+                paths = list(
+                    executor.map(
+                        lambda item: self.save_figure_to_png(
+                            item[0], suffix=item[1], close=False, draft=draft
+                        ),
+                        figures,
+                    )
+                )
+            for fig, _ in figures:
+                plt.close(fig)
             return paths
 
         return None
 
-    def run(self) -> tuple[pl.DataFrame, Path]:
+    def run_key(self) -> str:
+        """
+        Key identifying the inputs of this analysis's saved output.
+
+        Covers the processor's data fingerprint, the package source, the SQL and its
+        parameters, and the output path and format.
+
+        Returns:
+            Hex digest
+        """
+        return hashlib.sha1(
+            "\n".join(
+                [
+                    self.processor.data_fingerprint,
+                    code_fingerprint(),
+                    type(self).__qualname__,
+                    self.get_sql_statement(),
+                    str(self.get_sql_parameters()),
+                    str(self.output_path().resolve()),
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def run(self, force: bool = False) -> tuple[pl.DataFrame, Path]:
         """
         Execute query and save results.
 
-        Convenience method that combines execute() and save().
+        Convenience method that combines execute() and save(). If the output was
+        already saved from the same inputs (see run_key), it is loaded instead.
+
+        Args:
+            force: Execute and save even if the saved output is current
 
         Returns:
             Tuple of (DataFrame, output_path)
         """
+        key = self.run_key()
+        key_path = self.cache_dir / f"{self.name}.run"
+        output_path = self.output_path()
+
+        if (
+            not force
+            and output_path.exists()
+            and (not self.write_csv or self.output_path(suffix=".csv").exists())
+            and key_path.exists()
+            and key_path.read_text() == key
+        ):
+            return self.load_df(), output_path
+
         df = self.execute()
         path = self.save(df)
 
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key_path.write_text(key)
+
         return df, path
+
+    @staticmethod
+    def run_many(
+        analyses: List["AnalysisBase"],
+        force: bool = False,
+        max_workers: int = MAX_RUN_WORKERS,
+        return_exceptions: bool = False,
+    ) -> List[Union[tuple[pl.DataFrame, Path], Exception]]:
+        """
+        Run independent analyses concurrently.
+
+        DuckDB releases the GIL while a query executes, and each worker thread
+        queries through its own cursor on the processor's connection (see
+        ModularPatientDataProcessor.conn), so the queries run in parallel. Analyses
+        sharing a query still run it once (see query_df).
+
+        Args:
+            analyses: Analyses to run; none may change tables another one reads
+            force: Passed to run()
+            max_workers: Number of worker threads
+            return_exceptions: Return the error an analysis raised in place of its
+                result, instead of raising it
+
+        Returns:
+            run() result (or, with return_exceptions, error) of each analysis, in the
+            order given
+
+        Raises:
+            Exception: Unless return_exceptions, the error of the first failed analysis
+                in the order given, once all analyses have finished
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(analysis.run, force) for analysis in analyses]
+        if return_exceptions:
+            return [future.exception() or future.result() for future in futures]
+        return [future.result() for future in futures]
@@ -5,34 +5,36 @@ Section: 2.2 Data Source and Population
 Returns: field_name, total_records, non_null_records, completion_rate_pct
 """
 
-import polars as pl
-
 from medguard.analysis.base import AnalysisBase
 
 SQL = """
+WITH field_counts AS (
+    SELECT
+        UNNEST(['GP Events - EventDate', 'GP Events - SuppliedCode']) as field_name,
+        total_records,
+        UNNEST([event_date_records, supplied_code_records]) as non_null_records
+    FROM (
+        -- One scan of the events view; COUNT(column) is the non-null count
+        SELECT
+            COUNT(*) as total_records,
+            COUNT(EventDate) as event_date_records,
+            COUNT(SuppliedCode) as supplied_code_records
+        FROM {gp_events_view}
+        WHERE (Deleted = 'N' OR Deleted IS NULL)
+    )
+
+    UNION ALL
+
+    SELECT
+        'GP Events - Description',
+        COUNT(*) as total_records,
+        COUNT(description) as non_null_records
+    FROM {gp_events_enriched}
+)
 SELECT
-    'GP Events - EventDate' as field_name,
-    COUNT(*) as total_records,
-    SUM(CASE WHEN EventDate IS NOT NULL THEN 1 ELSE 0 END) as non_null_records
-FROM {gp_events_view}
-WHERE (Deleted = 'N' OR Deleted IS NULL)
-
-UNION ALL
-
-SELECT
-    'GP Events - SuppliedCode',
-    COUNT(*) as total_records,
-    SUM(CASE WHEN SuppliedCode IS NOT NULL THEN 1 ELSE 0 END) as non_null_records
-FROM {gp_events_view}
-WHERE (Deleted = 'N' OR Deleted IS NULL)
-
-UNION ALL
-
-SELECT
-    'GP Events - Description',
-    COUNT(*) as total_records,
-    SUM(CASE WHEN description IS NOT NULL THEN 1 ELSE 0 END) as non_null_records
-FROM {gp_events_enriched}
+    *,
+    ROUND(100.0 * non_null_records / total_records, 1) as completion_rate_pct
+FROM field_counts
 """
 
 
@@ -47,11 +49,3 @@ class DataCompletenessGPEventsAnalysis(AnalysisBase):
             gp_events_view=self.processor.default_kwargs["gp_events_view"],
             gp_events_enriched=self.processor.default_kwargs["gp_events_enriched"],
         )
-
-    def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Calculate completion rate percentage using polars
-        return df.with_columns(
-            ((pl.col("non_null_records") / pl.col("total_records")) * 100)
-            .round(1)
-            .alias("completion_rate_pct")
-        )
@@ -15,23 +15,34 @@ gp_prescriptions table. This should be investigated to understand if it's:
 Investigation needed to determine appropriate handling for visualization and interpretation.
 """
 
+import textwrap
+from typing import TYPE_CHECKING
+
 import polars as pl
-import matplotlib.pyplot as plt
 
-from medguard.analysis.base import AnalysisBase
+from medguard.analysis._plot_style import apply_style
+from medguard.analysis.base import ACTIVE_PRESCRIPTIONS_SQL, AnalysisBase
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
 
-# Reference date for "active medications" and age calculation
+# Reference date for "active medications" and age calculation (bound as the
+# $reference_date parameter, so the SQL text does not depend on it)
 REFERENCE_DATE = "2025-03-01"
 
 
+# Patient totals and elderly patients per medication bin. Both analyses below read
+# this one query (shared through the query cache), instead of each repeating the
+# patient and prescription CTEs. Being per-bin counts, it may be persisted on disk
+# (persist_query).
 SQL = """
 WITH patient_ages AS (
     -- Calculate age as of reference date
     SELECT
         pl.PK_Patient_Link_ID,
         p.Dob,
-        DATE_DIFF('year', p.Dob, DATE '{reference_date}') as age
+        DATE_DIFF('year', p.Dob, $reference_date::DATE) as age
     FROM {patient_link_view} pl
     LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
     WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
@@ -44,145 +55,134 @@ elderly_patients AS (
     FROM patient_ages
     WHERE age >= 65
 ),
+active_prescriptions AS (
+    -- One row per (patient, medication) active on reference date
+    {active_prescriptions}
+),
 active_medications_elderly AS (
-    -- Count active medications for each elderly patient on reference date
+    -- Count active medications for each elderly patient on reference date (both
+    -- sides are deduplicated, so a plain COUNT needs no DISTINCT)
     SELECT
         ep.PK_Patient_Link_ID,
         ep.age,
-        COUNT(DISTINCT gp.medication_code) as active_medication_count
-    FROM elderly_patients ep
-    LEFT JOIN {gp_prescriptions} gp
-        ON ep.PK_Patient_Link_ID = gp.FK_Patient_Link_ID
-        AND gp.medication_start_date <= DATE '{reference_date}'
-        AND (gp.medication_end_date IS NULL OR gp.medication_end_date >= DATE '{reference_date}')
+        COUNT(ap.medication_code) as active_medication_count
+    FROM (SELECT DISTINCT PK_Patient_Link_ID, age FROM elderly_patients) ep
+    LEFT JOIN active_prescriptions ap
+        ON ep.PK_Patient_Link_ID = ap.FK_Patient_Link_ID
     GROUP BY ep.PK_Patient_Link_ID, ep.age
 ),
 medication_bins AS (
     -- Bin medication counts: ≤5, 6-8, ≥9
     SELECT
-        PK_Patient_Link_ID,
-        age,
-        active_medication_count,
         CASE
             WHEN active_medication_count <= 5 THEN '0-5 medicines'
             WHEN active_medication_count BETWEEN 6 AND 8 THEN '6-8 medicines'
             WHEN active_medication_count >= 9 THEN '9+ medicines'
-        END as medication_bin
+        END as medication_bin,
+        COUNT(*) as patient_count
     FROM active_medications_elderly
-)
-SELECT
-    -- Summary statistics
-    (SELECT COUNT(*) FROM patient_ages) as total_patients,
-    (SELECT COUNT(*) FROM elderly_patients) as patients_65_and_above,
-
-    -- Medication bins for elderly
-    SUM(CASE WHEN medication_bin = '0-5 medicines' THEN 1 ELSE 0 END) as elderly_0_to_5_medicines,
-    SUM(CASE WHEN medication_bin = '6-8 medicines' THEN 1 ELSE 0 END) as elderly_6_to_8_medicines,
-    SUM(CASE WHEN medication_bin = '9+ medicines' THEN 1 ELSE 0 END) as elderly_9_plus_medicines
-FROM medication_bins
-"""
-
-
-SQL_DETAILED = """
-WITH patient_ages AS (
-    -- Calculate age as of reference date
-    SELECT
-        pl.PK_Patient_Link_ID,
-        p.Dob,
-        DATE_DIFF('year', p.Dob, DATE '{reference_date}') as age
-    FROM {patient_link_view} pl
-    LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
-    WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
-        AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
-        AND p.Dob IS NOT NULL
+    GROUP BY medication_bin
 ),
-elderly_patients AS (
-    -- Patients age 65 and above
-    SELECT *
-    FROM patient_ages
-    WHERE age >= 65
-),
-active_medications_elderly AS (
-    -- Count active medications for each elderly patient
+totals AS (
+    -- Summary statistics
     SELECT
-        ep.PK_Patient_Link_ID,
-        ep.age,
-        COUNT(DISTINCT gp.medication_code) as active_medication_count
-    FROM elderly_patients ep
-    LEFT JOIN {gp_prescriptions} gp
-        ON ep.PK_Patient_Link_ID = gp.FK_Patient_Link_ID
-        AND gp.medication_start_date <= DATE '{reference_date}'
-        AND (gp.medication_end_date IS NULL OR gp.medication_end_date >= DATE '{reference_date}')
-    GROUP BY ep.PK_Patient_Link_ID, ep.age
+        (SELECT COUNT(*) FROM patient_ages) as total_patients,
+        (SELECT COUNT(*) FROM elderly_patients) as patients_65_and_above
 )
+-- One row per non-empty bin (a single row with a null bin if there are none)
 SELECT
-    CASE
-        WHEN active_medication_count <= 5 THEN '0-5 medicines'
-        WHEN active_medication_count BETWEEN 6 AND 8 THEN '6-8 medicines'
-        WHEN active_medication_count >= 9 THEN '9+ medicines'
-    END as medication_bin,
-    COUNT(*) as patient_count
-FROM active_medications_elderly
-GROUP BY medication_bin
-ORDER BY
-    CASE
-        WHEN medication_bin = '0-5 medicines' THEN 1
-        WHEN medication_bin = '6-8 medicines' THEN 2
-        WHEN medication_bin = '9+ medicines' THEN 3
-    END
+    t.total_patients,
+    t.patients_65_and_above,
+    b.medication_bin,
+    b.patient_count
+FROM totals t
+LEFT JOIN medication_bins b ON TRUE
 """
 
 
+def get_elderly_medication_bins_sql(processor) -> str:
+    """(total_patients, patients_65_and_above, medication_bin, patient_count) query."""
+    return SQL.format(
+        patient_link_view=processor.default_kwargs["patient_link_view"],
+        patient_view=processor.default_kwargs["patient_view"],
+        active_prescriptions=textwrap.indent(
+            ACTIVE_PRESCRIPTIONS_SQL.format(
+                gp_prescriptions=processor.default_kwargs["gp_prescriptions"]
+            ).strip(),
+            "    ",
+        ).strip(),
+    )
+
+
 class ElderlyPatientsMedicationCountsAnalysis(AnalysisBase):
     """Summary: Elderly patients (65+) and medication count bins."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="elderly_patients_medication_counts")
 
     def get_sql_statement(self) -> str:
-        return SQL.format(
-            reference_date=REFERENCE_DATE,
-            patient_link_view=self.processor.default_kwargs["patient_link_view"],
-            patient_view=self.processor.default_kwargs["patient_view"],
-            gp_prescriptions=self.processor.default_kwargs["gp_prescriptions"],
-        )
+        return get_elderly_medication_bins_sql(self.processor)
+
+    def get_sql_parameters(self) -> dict:
+        return {"reference_date": REFERENCE_DATE}
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Add percentages for elderly medication bins
-        total_elderly = df["patients_65_and_above"][0]
+        # Elderly patients in each medication bin (Float64, as the SQL SUM gave)
+        def bin_count(medication_bin: str) -> pl.Expr:
+            return (
+                pl.col("patient_count")
+                .filter(pl.col("medication_bin") == medication_bin)
+                .sum()
+                .cast(pl.Float64)
+            )
 
-        return df.with_columns(
-            [
-                (pl.col("elderly_0_to_5_medicines") / total_elderly * 100)
-                .round(1)
-                .alias("elderly_0_to_5_medicines_pct"),
-                (pl.col("elderly_6_to_8_medicines") / total_elderly * 100)
-                .round(1)
-                .alias("elderly_6_to_8_medicines_pct"),
-                (pl.col("elderly_9_plus_medicines") / total_elderly * 100)
-                .round(1)
-                .alias("elderly_9_plus_medicines_pct"),
-                (pl.col("patients_65_and_above") / pl.col("total_patients") * 100)
-                .round(1)
-                .alias("pct_patients_65_and_above"),
-            ]
+        # Add percentages for elderly medication bins
+        total_elderly = pl.col("patients_65_and_above")
+
+        return (
+            df.lazy()
+            .select(
+                pl.col("total_patients").first(),
+                pl.col("patients_65_and_above").first(),
+                bin_count("0-5 medicines").alias("elderly_0_to_5_medicines"),
+                bin_count("6-8 medicines").alias("elderly_6_to_8_medicines"),
+                bin_count("9+ medicines").alias("elderly_9_plus_medicines"),
+            )
+            .with_columns(
+                [
+                    (pl.col("elderly_0_to_5_medicines") / total_elderly * 100)
+                    .round(1)
+                    .alias("elderly_0_to_5_medicines_pct"),
+                    (pl.col("elderly_6_to_8_medicines") / total_elderly * 100)
+                    .round(1)
+                    .alias("elderly_6_to_8_medicines_pct"),
+                    (pl.col("elderly_9_plus_medicines") / total_elderly * 100)
+                    .round(1)
+                    .alias("elderly_9_plus_medicines_pct"),
+                    (pl.col("patients_65_and_above") / pl.col("total_patients") * 100)
+                    .round(1)
+                    .alias("pct_patients_65_and_above"),
+                ]
+            )
+            .collect()
         )
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create vertical bar chart showing elderly patients by medication categories.
 
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
         categories = ["0-5\nMedications", "6-8\nMedications", "9+\nMedications"]
@@ -211,17 +211,14 @@ class ElderlyPatientsMedicationCountsAnalysis(AnalysisBase):
         )
 
         # Add value labels on top of bars
-        for i, (bar, pct, count) in enumerate(zip(bars, percentages, counts)):
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2.0,
-                height,
-                f"{pct}%\n(n={int(count):,})",
-                ha="center",
-                va="bottom",
-                fontsize=10,
-                fontweight="bold",
-            )
+        ax.bar_label(
+            bars,
+            labels=[
+                f"{pct}%\n(n={int(count):,})" for pct, count in zip(percentages, counts)
+            ],
+            fontsize=10,
+            fontweight="bold",
+        )
 
         # Labels and title
         ax.set_xlabel("Medication Category", fontweight="bold")
@@ -242,25 +239,28 @@ class ElderlyPatientsMedicationCountsAnalysis(AnalysisBase):
 class ElderlyPatientsMedicationCountsDetailedAnalysis(AnalysisBase):
     """Detailed breakdown: Elderly patients by medication count bins."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="elderly_patients_medication_counts_detailed")
 
     def get_sql_statement(self) -> str:
-        return SQL_DETAILED.format(
-            reference_date=REFERENCE_DATE,
-            patient_link_view=self.processor.default_kwargs["patient_link_view"],
-            patient_view=self.processor.default_kwargs["patient_view"],
-            gp_prescriptions=self.processor.default_kwargs["gp_prescriptions"],
-        )
+        return get_elderly_medication_bins_sql(self.processor)
 
-    def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Add percentages
-        total = df["patient_count"].sum()
+    def get_sql_parameters(self) -> dict:
+        return {"reference_date": REFERENCE_DATE}
 
-        return df.with_columns(
-            [
-                (pl.col("patient_count") / total * 100)
+    def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        # Non-empty bins (the labels sort in bin order), with percentages of the binned patients
+        return (
+            df.lazy()
+            .filter(pl.col("medication_bin").is_not_null())
+            .select("medication_bin", "patient_count")
+            .sort("medication_bin")
+            .with_columns(
+                (pl.col("patient_count") / pl.col("patient_count").sum() * 100)
                 .round(1)
-                .alias("pct_of_elderly"),
-            ]
+                .alias("pct_of_elderly")
+            )
+            .collect()
         )
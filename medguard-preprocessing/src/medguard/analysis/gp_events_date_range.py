@@ -10,22 +10,30 @@ import polars as pl
 
 from medguard.analysis.base import AnalysisBase
 
+# Output column for each quantile in the APPROX_QUANTILE list, in the same order
+QUANTILE_COLUMNS = [
+    "p0_1_date",
+    "p1_date",
+    "p5_date",
+    "p25_date",
+    "p50_date",
+    "p75_date",
+    "p95_date",
+    "p99_date",
+    "p99_9_date",
+]
+
 SQL = """
 SELECT
     MIN(EventDate) as min_date,
     MAX(EventDate) as max_date,
     COUNT(*) as total_events,
 
-    -- Percentiles to account for outliers/noise
-    APPROX_QUANTILE(EventDate, 0.001) as p0_1_date,
-    APPROX_QUANTILE(EventDate, 0.01) as p1_date,
-    APPROX_QUANTILE(EventDate, 0.05) as p5_date,
-    APPROX_QUANTILE(EventDate, 0.25) as p25_date,
-    APPROX_QUANTILE(EventDate, 0.50) as p50_date,
-    APPROX_QUANTILE(EventDate, 0.75) as p75_date,
-    APPROX_QUANTILE(EventDate, 0.95) as p95_date,
-    APPROX_QUANTILE(EventDate, 0.99) as p99_date,
-    APPROX_QUANTILE(EventDate, 0.999) as p99_9_date
+    -- Percentiles to account for outliers/noise, from a single quantile sketch
+    -- (one list per row, split into the QUANTILE_COLUMNS in post_process_df)
+    APPROX_QUANTILE(
+        EventDate, [0.001, 0.01, 0.05, 0.25, 0.50, 0.75, 0.95, 0.99, 0.999]
+    ) as quantiles
 FROM {gp_events_view}
 WHERE (Deleted = 'N' OR Deleted IS NULL)
     AND EventDate IS NOT NULL
@@ -44,6 +52,13 @@ class GPEventsDateRangeAnalysis(AnalysisBase):
         )
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        # Split the quantile list into one date column per percentile
+        df = (
+            df.with_columns(pl.col("quantiles").list.to_struct(fields=QUANTILE_COLUMNS))
+            .unnest("quantiles")
+            .with_columns(pl.col(QUANTILE_COLUMNS).cast(pl.Datetime("us")))
+        )
+
         # Calculate date ranges for different percentile brackets
         return df.with_columns(
             [
@@ -7,217 +7,254 @@ Returns: Binned counts of patients by number of GP events
          - Separate analyses for overall and since 2020
 """
 
+from typing import TYPE_CHECKING
+
 import polars as pl
-import matplotlib.pyplot as plt
 
+from medguard.analysis._plot_style import apply_style
 from medguard.analysis.base import AnalysisBase
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
-SQL_OVERALL = """
-WITH patient_event_counts AS (
-    SELECT
-        FK_Patient_Link_ID,
-        COUNT(*) as event_count
-    FROM {gp_events_view}
-    WHERE (Deleted = 'N' OR Deleted IS NULL)
-        AND EventDate IS NOT NULL
-    GROUP BY FK_Patient_Link_ID
-)
-SELECT
-    event_count,
-    COUNT(*) as patient_count
-FROM patient_event_counts
-GROUP BY event_count
-ORDER BY event_count
-"""
 
-SQL_SINCE_2020 = """
+# Patients by (all-time, since 2020) GP event counts, from a single scan of the
+# events table. All four analyses below read this one query (shared through the
+# query cache) and aggregate it in polars, instead of each scanning the table.
+# The result holds patient counts only, so they also persist it (persist_query).
+SQL_EVENT_COUNTS = """
 WITH patient_event_counts AS (
     SELECT
         FK_Patient_Link_ID,
-        COUNT(*) as event_count
+        COUNT(*) as event_count,
+        COUNT(*) FILTER (WHERE EventDate >= '2020-01-01') as event_count_since_2020
     FROM {gp_events_view}
     WHERE (Deleted = 'N' OR Deleted IS NULL)
         AND EventDate IS NOT NULL
-        AND EventDate >= '2020-01-01'
     GROUP BY FK_Patient_Link_ID
 )
 SELECT
     event_count,
+    event_count_since_2020,
     COUNT(*) as patient_count
 FROM patient_event_counts
-GROUP BY event_count
-ORDER BY event_count
+GROUP BY event_count, event_count_since_2020
 """
 
 
+def get_event_counts_sql(processor) -> str:
+    """Joint (event_count, event_count_since_2020, patient_count) query."""
+    return SQL_EVENT_COUNTS.format(
+        gp_events_view=processor.default_kwargs["gp_events_view"]
+    )
+
+
+def events_per_patient(df: pl.DataFrame, count_column: str) -> pl.DataFrame:
+    """
+    Per-count patient numbers for one of the event count columns.
+
+    Patients without events in the period (a count of 0, i.e. only events before
+    2020 for event_count_since_2020) are left out.
+
+    Args:
+        df: Result of SQL_EVENT_COUNTS
+        count_column: "event_count" or "event_count_since_2020"
+
+    Returns:
+        DataFrame of (event_count, patient_count) pairs, one per distinct count
+    """
+    return (
+        df.lazy()
+        .filter(pl.col(count_column) > 0)
+        .select(
+            pl.col(count_column).alias("event_count"),
+            pl.col("patient_count"),
+        )
+        .collect()
+    )
+
+
+def count_patients_by_events(df: pl.DataFrame, count_column: str) -> pl.DataFrame:
+    """Number of patients for each event count, ordered by count."""
+    return (
+        events_per_patient(df, count_column)
+        .group_by("event_count")
+        .agg(pl.col("patient_count").sum())
+        .sort("event_count")
+    )
+
+
+def add_cumulative_columns(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Add the running patient total and its percentage of all patients.
+
+    The running total is computed once and cumulative_pct is derived from it, so
+    the cumulative sum is not evaluated twice.
+    """
+    return (
+        df.lazy()
+        .with_columns(pl.col("patient_count").cum_sum().alias("cumulative_patients"))
+        .with_columns(
+            (pl.col("cumulative_patients") / pl.col("patient_count").sum() * 100)
+            .round(2)
+            .alias("cumulative_pct")
+        )
+        .collect()
+    )
+
+
 class GPEventsPerPatientHistogramOverallAnalysis(AnalysisBase):
     """Raw histogram data: patients by GP event count (all time)."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="gp_events_per_patient_histogram_overall")
 
     def get_sql_statement(self) -> str:
-        return SQL_OVERALL.format(
-            gp_events_view=self.processor.default_kwargs["gp_events_view"]
-        )
+        return get_event_counts_sql(self.processor)
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        df = count_patients_by_events(df, "event_count")
+
         # Add cumulative counts and percentiles for convenience
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                pl.col("patient_count").cum_sum().alias("cumulative_patients"),
-                (pl.col("patient_count").cum_sum() / total_patients * 100)
-                .round(2)
-                .alias("cumulative_pct"),
-            ]
-        )
+        return add_cumulative_columns(df)
 
 
 class GPEventsPerPatientHistogramSince2020Analysis(AnalysisBase):
     """Raw histogram data: patients by GP event count (since 2020)."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="gp_events_per_patient_histogram_since_2020")
 
     def get_sql_statement(self) -> str:
-        return SQL_SINCE_2020.format(
-            gp_events_view=self.processor.default_kwargs["gp_events_view"]
-        )
+        return get_event_counts_sql(self.processor)
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        df = count_patients_by_events(df, "event_count_since_2020")
+
         # Add cumulative counts and percentiles
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                pl.col("patient_count").cum_sum().alias("cumulative_patients"),
-                (pl.col("patient_count").cum_sum() / total_patients * 100)
-                .round(2)
-                .alias("cumulative_pct"),
-            ]
+        return add_cumulative_columns(df)
+
+
+# Binned histogram for easier visualization: upper bound of each bin (the last bin
+# is open-ended) and its label
+BIN_UPPER_BOUNDS = [0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+BIN_LABELS = [
+    "0",
+    "1-10",
+    "11-25",
+    "26-50",
+    "51-100",
+    "101-250",
+    "251-500",
+    "501-1000",
+    "1001-2500",
+    "2501-5000",
+    "5001-10000",
+    ">10000",
+]
+
+
+def bin_patients_by_events(df: pl.DataFrame, count_column: str) -> pl.DataFrame:
+    """
+    Number of patients and event count range of each bin, ordered by bin.
+
+    Args:
+        df: Result of SQL_EVENT_COUNTS
+        count_column: "event_count" or "event_count_since_2020"
+
+    Returns:
+        DataFrame of (bin, patient_count, min_events_in_bin, max_events_in_bin,
+        avg_events_in_bin) rows for the non-empty bins
+    """
+    events = pl.col("event_count")
+    patients = pl.col("patient_count")
+
+    # Mean events per patient, rounded half away from zero to 1 decimal place as
+    # DuckDB's ROUND does (polars rounds ties to even); the final round() only
+    # snaps the result to the nearest float
+    avg_events = (events * patients).sum() / patients.sum()
+    avg_events = ((avg_events * 10 + 0.5).floor() / 10).round(1)
+
+    # Bin index of each count by binary search over the sorted upper bounds (a
+    # vectorised bucketize, like SQL's width_bucket); rows are grouped on the
+    # integer index and labelled only once aggregated
+    bin_index = pl.lit(pl.Series(BIN_UPPER_BOUNDS)).search_sorted(events)
+    return (
+        events_per_patient(df, count_column)
+        .lazy()
+        .group_by(bin_index.alias("bin_index"))
+        .agg(
+            patients.sum(),
+            events.min().alias("min_events_in_bin"),
+            events.max().alias("max_events_in_bin"),
+            avg_events.alias("avg_events_in_bin"),
         )
-
-
-# Binned histogram for easier visualization
-SQL_BINNED = """
-WITH patient_event_counts AS (
-    SELECT
-        FK_Patient_Link_ID,
-        COUNT(*) as event_count
-    FROM {gp_events_view}
-    WHERE (Deleted = 'N' OR Deleted IS NULL)
-        AND EventDate IS NOT NULL
-        {date_filter}
-    GROUP BY FK_Patient_Link_ID
-),
-binned_counts AS (
-    SELECT
-        CASE
-            WHEN event_count = 0 THEN '0'
-            WHEN event_count BETWEEN 1 AND 10 THEN '1-10'
-            WHEN event_count BETWEEN 11 AND 25 THEN '11-25'
-            WHEN event_count BETWEEN 26 AND 50 THEN '26-50'
-            WHEN event_count BETWEEN 51 AND 100 THEN '51-100'
-            WHEN event_count BETWEEN 101 AND 250 THEN '101-250'
-            WHEN event_count BETWEEN 251 AND 500 THEN '251-500'
-            WHEN event_count BETWEEN 501 AND 1000 THEN '501-1000'
-            WHEN event_count BETWEEN 1001 AND 2500 THEN '1001-2500'
-            WHEN event_count BETWEEN 2501 AND 5000 THEN '2501-5000'
-            WHEN event_count BETWEEN 5001 AND 10000 THEN '5001-10000'
-            WHEN event_count > 10000 THEN '>10000'
-        END as bin,
-        event_count,
-        1 as patient
-    FROM patient_event_counts
-)
-SELECT
-    bin,
-    COUNT(*) as patient_count,
-    MIN(event_count) as min_events_in_bin,
-    MAX(event_count) as max_events_in_bin,
-    ROUND(AVG(event_count), 1) as avg_events_in_bin
-FROM binned_counts
-GROUP BY bin
-ORDER BY min_events_in_bin
-"""
+        .sort("bin_index")
+        .select(
+            pl.lit(pl.Series(BIN_LABELS)).gather(pl.col("bin_index")).alias("bin"),
+            pl.exclude("bin_index"),
+        )
+        .collect()
+    )
 
 
 class GPEventsPerPatientBinnedOverallAnalysis(AnalysisBase):
     """Binned histogram: patients by event count ranges (all time)."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="gp_events_per_patient_binned_overall")
 
     def get_sql_statement(self) -> str:
-        return SQL_BINNED.format(
-            gp_events_view=self.processor.default_kwargs["gp_events_view"],
-            date_filter="",
-        )
+        return get_event_counts_sql(self.processor)
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        df = bin_patients_by_events(df, "event_count")
+
         # Add percentage of total
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                (pl.col("patient_count") / total_patients * 100)
-                .round(2)
-                .alias("pct_of_patients"),
-                pl.col("patient_count").cum_sum().alias("cumulative_patients"),
-                (pl.col("patient_count").cum_sum() / total_patients * 100)
-                .round(2)
-                .alias("cumulative_pct"),
-            ]
-        )
+        return self._add_cum_and_pct(df, "pct_of_patients")
 
 
 class GPEventsPerPatientBinnedSince2020Analysis(AnalysisBase):
     """Binned histogram: patients by event count ranges (since 2020)."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="gp_events_per_patient_binned_since_2020")
 
     def get_sql_statement(self) -> str:
-        return SQL_BINNED.format(
-            gp_events_view=self.processor.default_kwargs["gp_events_view"],
-            date_filter="AND EventDate >= '2020-01-01'",
-        )
+        return get_event_counts_sql(self.processor)
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        df = bin_patients_by_events(df, "event_count_since_2020")
+
         # Add percentage of total
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                (pl.col("patient_count") / total_patients * 100)
-                .round(2)
-                .alias("pct_of_patients"),
-                pl.col("patient_count").cum_sum().alias("cumulative_patients"),
-                (pl.col("patient_count").cum_sum() / total_patients * 100)
-                .round(2)
-                .alias("cumulative_pct"),
-            ]
-        )
+        return self._add_cum_and_pct(df, "pct_of_patients")
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create bar chart showing distribution of GP events per patient (since 2020).
 
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
         bins = df["bin"].to_list()
         percentages = df["pct_of_patients"].to_list()
-        counts = df["patient_count"].to_list()
 
         # Create bar chart
         fig, ax = plt.subplots(figsize=(10, 6))
@@ -232,18 +269,12 @@ class GPEventsPerPatientBinnedSince2020Analysis(AnalysisBase):
             linewidth=0.5,
         )
 
-        # Add value labels on top of bars for percentages > 1%
-        for i, (bar, pct, count) in enumerate(zip(bars, percentages, counts)):
-            height = bar.get_height()
-            if pct >= 1.0:  # Only label bars with >= 1%
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height,
-                    f"{pct:.1f}%",
-                    ha="center",
-                    va="bottom",
-                    fontsize=9,
-                )
+        # Add value labels on top of bars for percentages >= 1% (others left blank)
+        ax.bar_label(
+            bars,
+            labels=[f"{pct:.1f}%" if pct >= 1.0 else "" for pct in percentages],
+            fontsize=9,
+        )
 
         # Labels and title
         ax.set_xlabel("Number of GP Events (Since 2020)", fontweight="bold")
@@ -6,8 +6,6 @@ Returns: patients_with_events_since_2020, mean_events_per_patient, median_events
          min_events, max_events, stddev_events
 """
 
-import polars as pl
-
 from medguard.analysis.base import AnalysisBase
 
 SQL = """
@@ -23,11 +21,11 @@ WITH patient_event_counts_since_2020 AS (
 )
 SELECT
     COUNT(*) as patients_with_events_since_2020,
-    AVG(event_count) as mean_events_per_patient,
-    MEDIAN(event_count) as median_events_per_patient,
+    ROUND(AVG(event_count), 1) as mean_events_per_patient,
+    ROUND(MEDIAN(event_count), 1) as median_events_per_patient,
     MIN(event_count) as min_events,
     MAX(event_count) as max_events,
-    STDDEV(event_count) as stddev_events
+    ROUND(STDDEV(event_count), 1) as stddev_events
 FROM patient_event_counts_since_2020
 """
 
@@ -42,13 +40,3 @@ class GPEventsPerPatientSince2020Analysis(AnalysisBase):
         return SQL.format(
             gp_events_view=self.processor.default_kwargs["gp_events_view"]
         )
-
-    def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Round numeric columns to 1 decimal place
-        return df.with_columns(
-            [
-                pl.col("mean_events_per_patient").round(1),
-                pl.col("median_events_per_patient").round(1),
-                pl.col("stddev_events").round(1),
-            ]
-        )
@@ -7,123 +7,156 @@ Returns: IMD score distribution for the dataset
          - Summary statistics for comparison with national averages
 """
 
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
 import polars as pl
-import matplotlib.pyplot as plt
 
+from medguard.analysis._plot_style import apply_style
 from medguard.analysis.base import AnalysisBase
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 
-SQL_IMD_HISTOGRAM = """
+# Patients per IMD score (NULL for patients without one), from a single scan of
+# the patient_link/patient join. The histogram, deciles and completeness analyses
+# below all read this one query (shared through the query cache) and aggregate it
+# in polars, instead of each re-running the join. It returns patient counts only,
+# so those analyses also persist it on disk (persist_query).
+SQL_IMD_COUNTS = """
 SELECT
-    IMD_Score,
+    p.IMD_Score,
     COUNT(*) as patient_count
 FROM {patient_link_view} pl
 LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
 WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
     AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
-    AND p.IMD_Score IS NOT NULL
-GROUP BY IMD_Score
-ORDER BY IMD_Score
+GROUP BY p.IMD_Score
 """
 
 
+# Kept as its own query: APPROX_QUANTILE needs the individual scores, so q1/q3
+# cannot be reproduced from the per-score counts above.
 SQL_IMD_SUMMARY = """
 WITH patient_imd AS (
     SELECT
         p.IMD_Score
     FROM {patient_link_view} pl
-    LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
+    INNER JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
     WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
         AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
         AND p.IMD_Score IS NOT NULL
 )
 SELECT
     COUNT(*) as total_patients_with_imd,
-    AVG(IMD_Score) as mean_imd,
-    STDDEV(IMD_Score) as stddev_imd,
+    ROUND(AVG(IMD_Score), 2) as mean_imd,
+    ROUND(STDDEV(IMD_Score), 2) as stddev_imd,
     MIN(IMD_Score) as min_imd,
     MAX(IMD_Score) as max_imd,
-    MEDIAN(IMD_Score) as median_imd,
-    APPROX_QUANTILE(IMD_Score, 0.25) as q1_imd,
-    APPROX_QUANTILE(IMD_Score, 0.75) as q3_imd
+    ROUND(MEDIAN(IMD_Score), 1) as median_imd,
+    ROUND(APPROX_QUANTILE(IMD_Score, 0.25), 1) as q1_imd,
+    ROUND(APPROX_QUANTILE(IMD_Score, 0.75), 1) as q3_imd
 FROM patient_imd
 """
 
 
-SQL_IMD_DECILES = """
-WITH patient_imd AS (
-    SELECT
-        p.IMD_Score,
-        -- UK IMD deciles: 1 = most deprived, 10 = least deprived
-        -- IMD_Score is a rank from 1-32844 (number of LSOAs in England)
-        -- Convert to deciles based on rank position
-        CASE
-            WHEN p.IMD_Score < 0 THEN '0 (Invalid)'
-            WHEN p.IMD_Score <= 3284 THEN '1 (Most deprived)'
-            WHEN p.IMD_Score <= 6568 THEN '2'
-            WHEN p.IMD_Score <= 9852 THEN '3'
-            WHEN p.IMD_Score <= 13136 THEN '4'
-            WHEN p.IMD_Score <= 16420 THEN '5'
-            WHEN p.IMD_Score <= 19704 THEN '6'
-            WHEN p.IMD_Score <= 22988 THEN '7'
-            WHEN p.IMD_Score <= 26272 THEN '8'
-            WHEN p.IMD_Score <= 29556 THEN '9'
-            ELSE '10 (Least deprived)'
-        END as imd_decile
-    FROM {patient_link_view} pl
-    LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
-    WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
-        AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
-        AND p.IMD_Score IS NOT NULL
+# UK IMD deciles: 1 = most deprived, 10 = least deprived. IMD_Score is a rank
+# from 1-32844 (number of LSOAs in England); each decile is an upper rank bound.
+IMD_DECILE_BOUNDS = [
+    (3284, "1 (Most deprived)"),
+    (6568, "2"),
+    (9852, "3"),
+    (13136, "4"),
+    (16420, "5"),
+    (19704, "6"),
+    (22988, "7"),
+    (26272, "8"),
+    (29556, "9"),
+]
+
+# Decile labels in plotting order, from invalid (negative) scores to least deprived
+IMD_DECILE_LABELS = (
+    ["0 (Invalid)"]
+    + [label for _, label in IMD_DECILE_BOUNDS]
+    + ["10 (Least deprived)"]
 )
-SELECT
-    imd_decile,
-    COUNT(*) as patient_count
-FROM patient_imd
-GROUP BY imd_decile
-ORDER BY imd_decile
-"""
 
+# x-axis tick labels for the decile plot; plain deciles are shown as they are
+IMD_DECILE_TICK_LABELS = {
+    "0 (Invalid)": "0\n(Invalid)",
+    "1 (Most deprived)": "1\n(Most\ndeprived)",
+    "10 (Least deprived)": "10\n(Least\ndeprived)",
+}
 
-SQL_IMD_COMPLETENESS = """
-SELECT
-    COUNT(*) as total_patients,
-    SUM(CASE WHEN p.IMD_Score IS NOT NULL THEN 1 ELSE 0 END) as patients_with_imd,
-    SUM(CASE WHEN p.IMD_Score IS NULL THEN 1 ELSE 0 END) as patients_without_imd,
-    ROUND(100.0 * SUM(CASE WHEN p.IMD_Score IS NOT NULL THEN 1 ELSE 0 END) / COUNT(*), 1) as imd_completion_rate_pct
-FROM {patient_link_view} pl
-LEFT JOIN {patient_view} p ON pl.PK_Patient_Link_ID = p.FK_Patient_Link_ID
-WHERE (pl.Merged != 'Y' OR pl.Merged IS NULL)
-    AND (pl.Deleted != 'Y' OR pl.Deleted IS NULL)
-"""
+
+@lru_cache(maxsize=None)
+def imd_decile_colors() -> dict:
+    """
+    Bar colour for each decile label, built on first use.
+
+    Gray for invalid scores, then a red (deprived) to green (affluent) gradient.
+    """
+    import matplotlib.pyplot as plt
+
+    colors_list = plt.cm.RdYlGn(range(0, 256, 256 // len(IMD_DECILE_LABELS)))
+    colors = {
+        IMD_DECILE_LABELS[0]: "#808080",
+        IMD_DECILE_LABELS[1]: colors_list[0],
+        IMD_DECILE_LABELS[-1]: colors_list[-1],
+    }
+    colors.update({label: colors_list[int(label)] for label in IMD_DECILE_LABELS[2:-1]})
+    return colors
+
+
+@lru_cache(maxsize=None)
+def imd_percentile_colors() -> np.ndarray:
+    """RGBA colour for each IMD percentile (0-99), red (deprived) to green (affluent)."""
+    import matplotlib.pyplot as plt
+
+    return plt.cm.RdYlGn(np.linspace(0, 1, 100))
+
+
+def get_imd_counts_sql(processor) -> str:
+    """Per-score (IMD_Score, patient_count) query, including a NULL score row."""
+    return SQL_IMD_COUNTS.format(
+        patient_link_view=processor.default_kwargs["patient_link_view"],
+        patient_view=processor.default_kwargs["patient_view"],
+    )
+
+
+def imd_decile_expr() -> pl.Expr:
+    """
+    Decile label for IMD_Score ('0 (Invalid)' for negative scores), as an Enum of
+    IMD_DECILE_LABELS so it groups and sorts on integer codes, in decile order.
+    """
+    score = pl.col("IMD_Score")
+    expr = pl.when(score < 0).then(pl.lit(IMD_DECILE_LABELS[0]))
+    for upper, label in IMD_DECILE_BOUNDS:
+        expr = expr.when(score <= upper).then(pl.lit(label))
+    return expr.otherwise(pl.lit(IMD_DECILE_LABELS[-1])).cast(
+        pl.Enum(IMD_DECILE_LABELS)
+    )
 
 
 class IMDHistogramAnalysis(AnalysisBase):
-    """Raw histogram of IMD scores (exact counts per score)."""
+    """Raw histogram of valid (non-negative) IMD scores (exact counts per score)."""
+
+    persist_query = True
 
     def __init__(self, processor):
         super().__init__(processor, name="imd_histogram")
 
     def get_sql_statement(self) -> str:
-        return SQL_IMD_HISTOGRAM.format(
-            patient_link_view=self.processor.default_kwargs["patient_link_view"],
-            patient_view=self.processor.default_kwargs["patient_view"],
-        )
+        return get_imd_counts_sql(self.processor)
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        # Invalid (negative) scores are only reported in the decile breakdown
+        df = df.filter(pl.col("IMD_Score") >= 0).sort("IMD_Score")
+
         # Add cumulative and percentage columns
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                (pl.col("patient_count") / total_patients * 100)
-                .round(2)
-                .alias("pct_of_patients"),
-                pl.col("patient_count").cum_sum().alias("cumulative_patients"),
-                (pl.col("patient_count").cum_sum() / total_patients * 100)
-                .round(2)
-                .alias("cumulative_pct"),
-            ]
-        )
+        return self._add_cum_and_pct(df, "pct_of_patients")
 
 
 class IMDSummaryStatisticsAnalysis(AnalysisBase):
@@ -138,113 +171,60 @@ class IMDSummaryStatisticsAnalysis(AnalysisBase):
             patient_view=self.processor.default_kwargs["patient_view"],
         )
 
-    def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Round all numeric columns
-        return df.with_columns(
-            [
-                pl.col("mean_imd").round(2),
-                pl.col("stddev_imd").round(2),
-                pl.col("median_imd").round(1),
-                pl.col("q1_imd").round(1),
-                pl.col("q3_imd").round(1),
-            ]
-        )
-
 
 class IMDDecilesAnalysis(AnalysisBase):
     """IMD distribution by decile (1=most deprived, 10=least deprived)."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="imd_deciles")
 
     def get_sql_statement(self) -> str:
-        return SQL_IMD_DECILES.format(
-            patient_link_view=self.processor.default_kwargs["patient_link_view"],
-            patient_view=self.processor.default_kwargs["patient_view"],
-        )
+        return get_imd_counts_sql(self.processor)
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # Add percentage column
-        total_patients = df["patient_count"].sum()
-        return df.with_columns(
-            [
-                (pl.col("patient_count") / total_patients * 100)
+        return (
+            df.lazy()
+            .filter(pl.col("IMD_Score").is_not_null())
+            .group_by(imd_decile_expr().alias("imd_decile"))
+            .agg(pl.col("patient_count").sum())
+            # Enum order is decile order (0-10), not the labels' lexical order
+            .sort("imd_decile")
+            # Add percentage column (the total is summed within the same plan)
+            .with_columns(
+                (pl.col("patient_count") / pl.col("patient_count").sum() * 100)
                 .round(1)
-                .alias("pct_of_patients"),
-            ]
+                .alias("pct_of_patients")
+            )
+            .collect()
         )
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create bar chart showing IMD decile distribution.
 
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
-
-        # Create ordered decile labels (0-10)
-        # Need to properly order the deciles since SQL returns them as strings
-        decile_order = [
-            "0 (Invalid)",
-            "1 (Most deprived)",
-            "2",
-            "3",
-            "4",
-            "5",
-            "6",
-            "7",
-            "8",
-            "9",
-            "10 (Least deprived)",
-        ]
-
-        # Create a mapping for sorting
-        decile_to_num = {decile: i for i, decile in enumerate(decile_order)}
-
-        # Sort dataframe by decile order
-        df = df.with_columns(
-            [
-                pl.col("imd_decile")
-                .map_elements(lambda x: decile_to_num.get(x, 99), return_dtype=pl.Int64)
-                .alias("sort_order")
-            ]
-        ).sort("sort_order")
+        apply_style()
 
-        # Extract data
+        # Extract data (rows are saved in decile order, see post_process_df)
         deciles = df["imd_decile"].to_list()
         percentages = df["pct_of_patients"].to_list()
-        counts = df["patient_count"].to_list()
 
         # Create bar chart
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        # Use gradient from red (deprived) to green (affluent)
-        # Generate enough colors for all deciles (up to 11 if invalid exists)
-        num_colors = max(len(deciles), 11)
-        color_step = 256 // num_colors
-        colors_list = plt.cm.RdYlGn(range(0, 256, color_step))
-
-        # Assign colors based on decile labels (gray for invalid, gradient for 1-10)
-        colors = []
-        for decile in deciles:
-            if "Invalid" in decile:
-                colors.append("#808080")  # Gray for invalid
-            elif "Most" in decile:
-                colors.append(colors_list[0])  # First color (red)
-            elif "Least" in decile:
-                colors.append(colors_list[-1])  # Last color (green)
-            else:
-                # Extract decile number and map to color
-                decile_num = int(decile)
-                colors.append(colors_list[decile_num])
+        # Gray for invalid, gradient from red (deprived) to green (affluent)
+        decile_colors = imd_decile_colors()
+        colors = [decile_colors[decile] for decile in deciles]
 
         bars = ax.bar(
             range(len(deciles)),
@@ -255,30 +235,17 @@ class IMDDecilesAnalysis(AnalysisBase):
             linewidth=0.5,
         )
 
-        # Add value labels on bars (only if percentage > 0.5%)
-        for i, (bar, pct, count) in enumerate(zip(bars, percentages, counts)):
-            height = bar.get_height()
-            if pct >= 0.5:
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height,
-                    f"{pct:.1f}%",
-                    ha="center",
-                    va="bottom",
-                    fontsize=9,
-                )
+        # Add value labels on bars for percentages >= 0.5% (others left blank)
+        ax.bar_label(
+            bars,
+            labels=[f"{pct:.1f}%" if pct >= 0.5 else "" for pct in percentages],
+            fontsize=9,
+        )
 
         # Clean up decile labels for x-axis
-        clean_labels = []
-        for decile in deciles:
-            if "Invalid" in decile:
-                clean_labels.append("0\n(Invalid)")
-            elif "Most" in decile:
-                clean_labels.append("1\n(Most\ndeprived)")
-            elif "Least" in decile:
-                clean_labels.append("10\n(Least\ndeprived)")
-            else:
-                clean_labels.append(decile)
+        clean_labels = [
+            IMD_DECILE_TICK_LABELS.get(decile, decile) for decile in deciles
+        ]
 
         # Labels and title
         ax.set_xticks(range(len(deciles)))
@@ -301,18 +268,30 @@ class IMDDecilesAnalysis(AnalysisBase):
 class IMDCompletenessAnalysis(AnalysisBase):
     """Data completeness for IMD scores."""
 
+    persist_query = True
+
     def __init__(self, processor):
         super().__init__(processor, name="imd_completeness")
 
     def get_sql_statement(self) -> str:
-        return SQL_IMD_COMPLETENESS.format(
-            patient_link_view=self.processor.default_kwargs["patient_link_view"],
-            patient_view=self.processor.default_kwargs["patient_view"],
-        )
+        return get_imd_counts_sql(self.processor)
 
     def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # No transformation needed
-        return df
+        has_imd = pl.col("IMD_Score").is_not_null()
+        total = pl.col("patient_count").sum()
+        with_imd = pl.col("patient_count").filter(has_imd).sum()
+        rate = with_imd / total * 1000
+
+        return df.select(
+            total.alias("total_patients"),
+            with_imd.alias("patients_with_imd"),
+            pl.col("patient_count")
+            .filter(~has_imd)
+            .sum()
+            .alias("patients_without_imd"),
+            # Rounded half away from zero, as the SQL ROUND this replaces did
+            ((rate + 0.5).floor() / 10).round(1).alias("imd_completion_rate_pct"),
+        )
 
 
 class IMDPercentilesPlotAnalysis(AnalysisBase):
@@ -329,62 +308,46 @@ class IMDPercentilesPlotAnalysis(AnalysisBase):
         # This analysis doesn't save data, only creates plots
         return pl.DataFrame()
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create bar chart showing IMD percentile distribution.
-        Calculates percentiles from the imd_histogram.csv file.
+        Calculates percentiles from the imd_histogram output.
 
         Returns:
             Matplotlib figure
         """
-        # Load the histogram data
-        from pathlib import Path
-
-        histogram_path = Path(self.output_dir) / "imd_histogram.csv"
-        df = pl.read_csv(histogram_path)
-
-        # Filter out invalid scores (< 0)
-        df_valid = df.filter(pl.col("IMD_Score") >= 0)
-
-        # Calculate percentiles based on rank (IMD_Score is the rank 1-32844)
-        # Each percentile represents 328.44 LSOAs
-        df_valid = df_valid.with_columns(
-            [
-                ((pl.col("IMD_Score") - 1) / 328.44)
-                .floor()
-                .cast(pl.Int64)
-                .alias("percentile_raw")
-            ]
-        )
+        import matplotlib.pyplot as plt
 
-        # Cap at percentile 99 (0-99 for 100 percentiles)
-        df_valid = df_valid.with_columns(
-            [
-                pl.when(pl.col("percentile_raw") > 99)
-                .then(pl.lit(99))
-                .otherwise(pl.col("percentile_raw"))
-                .alias("imd_percentile")
-            ]
+        # Load the histogram data
+        df = self.load_df("imd_histogram")
+
+        # Calculate percentiles based on rank (IMD_Score is the rank 1-32844), capped
+        # at 99 (0-99 for 100 percentiles). Each percentile represents 328.44 LSOAs,
+        # i.e. floor((rank - 1) / 328.44), computed exactly in integers; the
+        # histogram only holds valid (non-negative) scores.
+        df_valid = df.with_columns(
+            pl.min_horizontal(
+                (pl.col("IMD_Score") - 1) * 100 // 32844,
+                pl.lit(99),
+            ).alias("imd_percentile")
         )
 
-        # Group by percentile and sum patient counts
+        # Group by percentile and sum patient counts, then calculate percentages
         percentile_df = (
-            df_valid.group_by("imd_percentile")
-            .agg([pl.col("patient_count").sum().alias("patient_count")])
+            df_valid.lazy()
+            .group_by("imd_percentile")
+            .agg(pl.col("patient_count").sum())
             .sort("imd_percentile")
-        )
-
-        # Calculate percentages
-        total = percentile_df["patient_count"].sum()
-        percentile_df = percentile_df.with_columns(
-            [(pl.col("patient_count") / total * 100).round(2).alias("pct_of_patients")]
+            .with_columns(
+                (pl.col("patient_count") / pl.col("patient_count").sum() * 100)
+                .round(2)
+                .alias("pct_of_patients")
+            )
+            .collect()
         )
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
         percentiles = percentile_df["imd_percentile"].to_list()
@@ -393,11 +356,8 @@ class IMDPercentilesPlotAnalysis(AnalysisBase):
         # Create bar chart
         fig, ax = plt.subplots(figsize=(12, 6))
 
-        # Use gradient from red (deprived) to green (affluent)
-        colors = plt.cm.RdYlGn([i / 99 for i in range(100)])
-
-        # Map percentiles to colors
-        bar_colors = [colors[p] for p in percentiles]
+        # Map percentiles to a gradient from red (deprived) to green (affluent)
+        bar_colors = imd_percentile_colors()[percentiles]
 
         bars = ax.bar(
             percentiles,
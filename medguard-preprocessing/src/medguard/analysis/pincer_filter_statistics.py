@@ -11,14 +11,17 @@ Three separate analysis classes:
 """
 
 from datetime import datetime, date
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 import logging
 
 import polars as pl
-import matplotlib.pyplot as plt
 
+from medguard.analysis._plot_style import apply_style
 from medguard.analysis.base import AnalysisBase
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 logger = logging.getLogger(__name__)
 
 
@@ -304,14 +307,13 @@ class PincerFilterSummaryAnalysis(AnalysisBase):
         Returns:
             List of (figure, suffix) tuples for multiple plots
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
         filter_ids = df["filter_id"].to_list()
@@ -448,21 +450,20 @@ class PincerFilterMultipleMatchesAnalysis(AnalysisBase):
 
         return pl.DataFrame(rows)
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create bar chart showing distribution of patients by number of PINCER filters matched.
 
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
         num_filters = df["number_of_filters_matched"].to_list()
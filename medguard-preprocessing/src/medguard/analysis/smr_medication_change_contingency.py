@@ -18,11 +18,15 @@ within a 3-month window around SMRs (for repeat medications only).
 """
 
 import logging
+from typing import TYPE_CHECKING
 import polars as pl
-import matplotlib.pyplot as plt
 
+from medguard.analysis._plot_style import apply_style
 from medguard.analysis.base import AnalysisBase
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 logger = logging.getLogger(__name__)
 
 
@@ -169,21 +173,20 @@ class SMRMedicationChangeContingencyAnalysis(AnalysisBase):
 
         return result
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create grouped bar chart showing outcome codes vs medication changes.
 
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Prepare data for grouped bar chart
         positive_data = df.filter(pl.col("outcome_type") == "positive_outcome").sort(
@@ -30,13 +30,17 @@ negative/no-action codes. This suggests SMR codes don't reliably predict medicat
 import logging
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import polars as pl
-import matplotlib.pyplot as plt
 from scipy import stats
 
+from medguard.analysis._plot_style import apply_style
 from medguard.analysis.base import AnalysisBase
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 logger = logging.getLogger(__name__)
 
 
@@ -240,21 +244,20 @@ class SMRTimeToMedicationChangeAnalysis(AnalysisBase):
 
         return pl.DataFrame(all_rows)
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create grouped bar chart comparing median time to medication change.
 
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Filter to only the median rows (exclude difference and mann_whitney_u rows)
         median_df = df.filter(
@@ -593,7 +596,7 @@ class SMRTimeToMedicationChangeRawDataAnalysis(AnalysisBase):
             ["outcome_type", "medication_type", "change_type", "days_to_change"]
         ).sort(["medication_type", "outcome_type", "change_type", "days_to_change"])
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create overlapping histogram showing distribution of time to medication change.
 
@@ -602,14 +605,13 @@ class SMRTimeToMedicationChangeRawDataAnalysis(AnalysisBase):
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Filter to just positive and negative outcomes (all medication types)
         plot_df = df.filter(
@@ -24,11 +24,15 @@ to longer time windows, showing sensitivity to the chosen time window.
 
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 import polars as pl
-import matplotlib.pyplot as plt
 
+from medguard.analysis._plot_style import apply_style
 from medguard.analysis.base import AnalysisBase
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 logger = logging.getLogger(__name__)
 
 
@@ -181,21 +185,20 @@ class SMRTimeWindowSensitivityAnalysis(AnalysisBase):
 
         return df
 
-    def plot(self) -> plt.Figure:
+    def plot(self) -> "plt.Figure":
         """
         Create line plot showing medication change detection sensitivity to time window.
 
         Returns:
             Matplotlib figure
         """
+        import matplotlib.pyplot as plt
+
         # Load the saved data
         df = self.load_df()
 
         # Set publication-quality style
-        plt.style.use("seaborn-v0_8-paper")
-        plt.rcParams["font.size"] = 11
-        plt.rcParams["axes.labelsize"] = 12
-        plt.rcParams["axes.titlesize"] = 13
+        apply_style()
 
         # Extract data
         days = df["time_window_days"].to_list()
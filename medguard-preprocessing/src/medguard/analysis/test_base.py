@@ -0,0 +1,79 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from medguard.analysis.base import AnalysisBase, _cum_pct
+
+
+def test_cum_pct_counts():
+    """Test percentages and running totals of a histogram"""
+    pct, cumulative, cumulative_pct = _cum_pct(np.array([1, 3], dtype=np.int64))
+
+    assert pct.tolist() == [25.0, 75.0]
+    assert cumulative.tolist() == [1, 4]
+    assert cumulative_pct.tolist() == [25.0, 100.0]
+
+
+def test_cum_pct_empty():
+    """Test that an empty histogram gives empty arrays"""
+    pct, cumulative, cumulative_pct = _cum_pct(np.array([], dtype=np.int64))
+
+    assert pct.shape == (0,)
+    assert cumulative.shape == (0,)
+    assert cumulative_pct.shape == (0,)
+
+
+def test_cum_pct_all_zero():
+    """Test that an all-zero histogram gives NaN percentages rather than raising"""
+    pct, cumulative, cumulative_pct = _cum_pct(np.array([0, 0], dtype=np.int64))
+
+    assert np.isnan(pct).all()
+    assert cumulative.tolist() == [0, 0]
+    assert np.isnan(cumulative_pct).all()
+
+
+def test_add_cum_and_pct_empty():
+    """Test that an empty histogram frame gets empty percentage columns"""
+    df = pl.DataFrame({"patient_count": []}, schema={"patient_count": pl.Int64})
+
+    result = AnalysisBase._add_cum_and_pct(None, df, "pct_of_patients")
+
+    assert result.columns == [
+        "patient_count",
+        "pct_of_patients",
+        "cumulative_patients",
+        "cumulative_pct",
+    ]
+    assert result.height == 0
+
+
+class _StubAnalysis:
+    def __init__(self, result):
+        self.result = result
+
+    def run(self, force=False):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_run_many_return_exceptions():
+    """Test that run_many returns failures in place, in the order given"""
+    error = ValueError("failed")
+    analyses = [_StubAnalysis("first"), _StubAnalysis(error), _StubAnalysis("last")]
+
+    results = AnalysisBase.run_many(analyses, return_exceptions=True)
+
+    assert results == ["first", error, "last"]
+
+
+def test_run_many_raises_first_failure_in_order():
+    """Test that run_many re-raises the first failure in list order"""
+    analyses = [
+        _StubAnalysis("ok"),
+        _StubAnalysis(KeyError("second")),
+        _StubAnalysis(ValueError("third")),
+    ]
+
+    with pytest.raises(KeyError):
+        AnalysisBase.run_many(analyses)
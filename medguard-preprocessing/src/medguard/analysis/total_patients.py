@@ -5,7 +5,6 @@ Section: 2.2 Data Source and Population
 Returns: Single row with total_patients count
 """
 
-import polars as pl
 from medguard.analysis.base import AnalysisBase
 
 
@@ -28,7 +27,3 @@ class TotalPatientsAnalysis(AnalysisBase):
         return SQL.format(
             patient_link_view=self.processor.default_kwargs["patient_link_view"]
         )
-
-    def post_process_df(self, df: pl.DataFrame) -> pl.DataFrame:
-        # No transformation needed
-        return df
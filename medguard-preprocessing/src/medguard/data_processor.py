@@ -1,8 +1,11 @@
+import hashlib
 import json
 import logging
+import threading
 from datetime import date, datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, List
 
 import duckdb
 
@@ -28,8 +31,15 @@ class ModularPatientDataProcessor:
         initialise_enriched_views: bool = True,
     ):
         self.base_path = Path(base_path)
-        self.conn = duckdb.connect()
+        self._conn = duckdb.connect()
+        self._conn_thread = threading.get_ident()
+        self._thread_local = threading.local()
         self.table_views = {}
+
+        # Derived data shared between callers (see get_or_build)
+        self._built: Dict[str, Any] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._build_locks_guard = threading.Lock()
         self.sql_loader = SQLTemplateLoader()
 
         self.default_kwargs = {
@@ -210,6 +220,66 @@ class ModularPatientDataProcessor:
         # Initialize views on creation
         self._initialize(initialise_enriched_views)
 
+    @property
+    def conn(self) -> duckdb.DuckDBPyConnection:
+        """
+        DuckDB connection for the calling thread.
+
+        A DuckDB connection must not be shared between threads, so any thread other than
+        the one that created the processor gets its own cursor on the same in-memory
+        database (tables and views are shared).
+        """
+        if threading.get_ident() == self._conn_thread:
+            return self._conn
+        cursor = getattr(self._thread_local, "cursor", None)
+        if cursor is None:
+            cursor = self._thread_local.cursor = self._conn.cursor()
+        return cursor
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> Any:
+        """
+        Return the value cached under key, calling build() to create it on first use.
+
+        Lets analyses sharing this processor reuse derived data (query results,
+        per-patient frames) instead of recomputing it. Concurrent callers asking for
+        the same key wait for a single build.
+        """
+        with self._build_locks_guard:
+            lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if key not in self._built:
+                self._built[key] = build()
+            return self._built[key]
+
+    @cached_property
+    def data_fingerprint(self) -> str:
+        """
+        Hash of everything query results depend on besides the SQL text.
+
+        Covers the source parquet files, the input CSVs and the SQL templates (path,
+        size and modification time of each), so persisted results are invalidated when
+        any of them change.
+        """
+        paths = [
+            path
+            for pattern in self.discover_tables().values()
+            for path in Path(pattern).parent.glob("*.parquet")
+        ]
+        paths += [
+            Path(value)
+            for key, value in self.default_kwargs.items()
+            if key.endswith("_input_file")
+        ]
+        paths += self.sql_loader.base_path.rglob("*.sql")
+
+        digest = hashlib.sha1(str(self.base_path.resolve()).encode())
+        for path in sorted(paths):
+            if path.exists():
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
     def _initialize(self, initialise_enriched_views: bool):
         """Initialize the processor by discovering tables and creating views"""
         logger.info("Initializing ModularPatientDataProcessor...")